@@ -1,53 +1,95 @@
+import os
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import streamlit as st
-from statsmodels.tsa.statespace.sarimax import SARIMAX
-
-
-# Fungsi untuk membaca data dari file Excel
-def load_data(file_path):
-    return pd.read_excel(file_path, parse_dates=['Date'])
-
-# Load data
-df = load_data('financial_sample.xlsx')
-
-# Menampilkan beberapa baris pertama dari data
-st.write("Dataframe Head:", df.head())
-
-# Menampilkan beberapa baris pertama dari data
-st.write("Dataframe Tail:", df.tail())
-
-# Mengatur index pada kolom Date
-df.set_index('Date', inplace=True)
-
-# Mengubah kolom Sales dan Profit menjadi numerik (jika tidak sudah numerik)
-df['Sales'] = pd.to_numeric(df['Sales'], errors='coerce')
-df['Profit'] = pd.to_numeric(df['Profit'], errors='coerce')
-
-# Menghapus baris dengan nilai NaN
-df.dropna(subset=['Sales', 'Profit'], inplace=True)
-
-# Resampling data berdasarkan bulan untuk penjualan dan profit
-monthly_sales = df['Sales'].resample('M').sum()
-monthly_profit = df['Profit'].resample('M').sum()
+from downsample import downsample_series
+import forecasting
+from backtest import rolling_backtest
+from order_search import search_orders
+from partitions import months_between
+from pipelines import FINANCIAL_FILE, financial_monthly, load_financial_partitions
+from progressive import Sections
+
+# Kolom asli workbook yang ditampilkan di preview (tanpa kolom hasil kali dan Transactions)
+RAW_COLUMNS = ["Segment", "Country", "Product", "Discount Band", "Units Sold", "Manufacturing Price", "Sale Price",
+               "Gross Sales", "Discounts", "Sales", "COGS", "Profit", "Date", "Month Number", "Month", "Year"]
+
+# Jumlah bulan minimal dalam periode agar model bisa dilatih (80% train) dan
+# masih ada bulan test untuk evaluasi dan backtest
+MIN_MONTHS = 6
+
+
+# Data finansial disimpan terpartisi per tahun/bulan dengan statistik min/max
+# per partisi (lihat partitions.py). Partisi dibuka sekali per versi file sumber
+# (mtime dan ukuran), jadi rerun tidak menghitung hash workbook lagi; partisi
+# baru dibaca untuk bulan-bulan dalam periode yang dipilih
+@st.cache_resource(max_entries=1)
+def get_financial_partitions(mtime_ns, size):
+    return load_financial_partitions()
+
+source = os.stat(FINANCIAL_FILE)
+financial_data = get_financial_partitions(source.st_mtime_ns, source.st_size)
+
+# Filter periode data historis untuk model
+months = months_between(*financial_data.date_range())
+start, end = months[0], months[-1]
+if len(months) > 1:
+    start, end = st.sidebar.select_slider("Select the Period:", options=months, value=(start, end),
+                                          format_func=lambda month: month.strftime("%Y-%m"))
+
+# Menampilkan beberapa baris pertama dan terakhir (hanya partisi pertama dan terakhir yang dibaca)
+preview_columns = [column for column in financial_data.columns() if column in RAW_COLUMNS]
+st.write("Dataframe Head:", financial_data.head(5, start, end, columns=preview_columns))
+st.write("Dataframe Tail:", financial_data.tail(5, start, end, columns=preview_columns))
+
+# Deret penjualan dan profit bulanan dari partisi bulanan yang sudah dijumlahkan,
+# pengganti resample('M') pada semua baris workbook
+monthly = financial_monthly(financial_data.read(start, end, level="monthly", columns=["Date", "Sales", "Profit"]))
+monthly_sales = monthly["Sales"]
+monthly_profit = monthly["Profit"]
 
 # Menampilkan data penjualan dan profit bulanan
 st.write("Monthly Sales:", monthly_sales.head())
 st.write("Monthly Profit:", monthly_profit.head())
 
+# Periode yang terlalu pendek tidak bisa dilatih (mis. LinAlgError untuk satu bulan)
+if len(monthly_sales) < MIN_MONTHS:
+    st.warning(f"Select a period of at least {MIN_MONTHS} months to train and evaluate the models.")
+    st.stop()
+
 # Fungsi untuk membangun dan melatih model ARIMA
-def build_and_train_model(data):
-    train = data[:int(0.8 * len(data))]
-    test = data[int(0.8 * len(data)):]
-    model = SARIMAX(train, order=(1, 1, 1), seasonal_order=(1, 1, 1, 12))
-    results = model.fit()
-    return results, test
+# Model disimpan di memori (st.cache_resource) dan di disk (model_store), jadi
+# fit hanya dijalankan ulang jika data atau order model berubah. Bulan baru di akhir
+# data cukup memperpanjang model lama tanpa fit ulang (lihat model_store.REFIT_EVERY)
+@st.cache_resource
+def build_and_train_model(data, order=(1, 1, 1), seasonal_order=(1, 1, 1, 12)):
+    return forecasting.build_and_train_model(data, order, seasonal_order)
+
+# Mode pemilihan order otomatis: order dicari dari grid kandidat berdasarkan AIC pada data train
+@st.cache_data
+def select_orders(data):
+    order, seasonal_order, _ = search_orders(data[:int(0.8 * len(data))])
+    return order, seasonal_order
+
+default_orders = ((1, 1, 1), (1, 1, 1, 12))
+# Fit dan pencarian order untuk penjualan dan profit berjalan paralel di thread
+# latar; rerun baru (mis. checkbox diubah) membatalkan yang belum dimulai
+sections = Sections("prediction")
+if st.checkbox("Select SARIMAX orders automatically (AIC)"):
+    sales_search = sections.submit(lambda: select_orders(monthly_sales))
+    profit_search = sections.submit(lambda: select_orders(monthly_profit))
+    sales_orders = sections.result(sales_search, "Searching SARIMAX orders...")
+    profit_orders = sections.result(profit_search, "Searching SARIMAX orders...")
+    st.write("Sales Orders:", sales_orders, "Profit Orders:", profit_orders)
+else:
+    sales_orders = profit_orders = default_orders
 
 # Membangun dan melatih model ARIMA untuk penjualan
-sales_model, sales_test = build_and_train_model(monthly_sales)
-profit_model, profit_test = build_and_train_model(monthly_profit)
+sales_fit = sections.submit(lambda: build_and_train_model(monthly_sales, *sales_orders))
+profit_fit = sections.submit(lambda: build_and_train_model(monthly_profit, *profit_orders))
+sales_model, sales_test = sections.result(sales_fit, "Fitting SARIMAX models...")
+profit_model, profit_test = sections.result(profit_fit, "Fitting SARIMAX models...")
 
 # Melakukan prediksi
 sales_predictions = sales_model.get_forecast(steps=len(sales_test))
@@ -58,11 +100,18 @@ profit_predictions = profit_model.get_forecast(steps=len(profit_test))
 profit_predicted_mean = profit_predictions.predicted_mean
 profit_predicted_conf_int = profit_predictions.conf_int()
 
+# Deret historis dipangkas ke jumlah titik yang bisa ditampilkan sebelum diplot
+plot_sales = downsample_series(monthly_sales)
+plot_profit = downsample_series(monthly_profit)
+
+# matplotlib baru diimpor saat plot pertama dibuat, setelah data tampil
+import matplotlib.pyplot as plt
+
 # Menampilkan hasil prediksi penjualan
 fig, ax = plt.subplots(2, 1, figsize=(12, 12))
 
 # Plot untuk prediksi penjualan
-ax[0].plot(monthly_sales.index, monthly_sales, label='Actual Sales', color='gray')
+ax[0].plot(plot_sales.index, plot_sales, label='Actual Sales', color='gray')
 ax[0].plot(sales_predicted_mean.index, sales_predicted_mean, label='Predicted Sales', color='red')
 ax[0].fill_between(sales_predicted_conf_int.index,
                    sales_predicted_conf_int.iloc[:, 0],
@@ -74,7 +123,7 @@ ax[0].legend()
 ax[0].grid()
 
 # Plot untuk prediksi profit
-ax[1].plot(monthly_profit.index, monthly_profit, label='Actual Profit', color='gray')
+ax[1].plot(plot_profit.index, plot_profit, label='Actual Profit', color='gray')
 ax[1].plot(profit_predicted_mean.index, profit_predicted_mean, label='Predicted Profit', color='brown')
 ax[1].fill_between(profit_predicted_conf_int.index,
                    profit_predicted_conf_int.iloc[:, 0],
@@ -124,7 +173,7 @@ future_df = pd.DataFrame({
 fig, ax = plt.subplots(2, 1, figsize=(12, 12))
 
 # Plot untuk prediksi penjualan masa depan
-ax[0].plot(monthly_sales.index, monthly_sales, label='Historical Sales')
+ax[0].plot(plot_sales.index, plot_sales, label='Historical Sales')
 ax[0].plot(future_sales_mean.index, future_sales_mean, label='Future Sales Predictions', color='red')
 ax[0].fill_between(future_sales_conf_int.index,
                    future_sales_conf_int.iloc[:, 0],
@@ -136,7 +185,7 @@ ax[0].legend()
 ax[0].grid()
 
 # Plot untuk prediksi profit masa depan
-ax[1].plot(monthly_profit.index, monthly_profit, label='Historical Profit')
+ax[1].plot(plot_profit.index, plot_profit, label='Historical Profit')
 ax[1].plot(future_profit_mean.index, future_profit_mean, label='Future Profit Predictions', color='brown')
 ax[1].fill_between(future_profit_conf_int.index,
                    future_profit_conf_int.iloc[:, 0],
@@ -149,3 +198,30 @@ ax[1].grid()
 
 # Menampilkan plot prediksi masa depan di Streamlit
 st.pyplot(fig)
+
+
+# Forecast per segmen (Product x Country dan Segment), dijalankan paralel
+@st.cache_data
+def forecast_all_segments(data):
+    return forecasting.forecast_segments(data, steps=future_steps)
+
+if st.checkbox("Show forecasts per segment (Product x Country, Segment)"):
+    # Baris bersih dalam periode, hanya kolom yang dipakai forecast per segmen
+    df = financial_data.read(start, end, columns=["Date", "Product", "Country", "Segment", "Sales", "Profit"]).set_index("Date")
+    segment_forecasts, segment_timings = forecast_all_segments(df)
+    failed = segment_timings[segment_timings["Status"] != "ok"]
+    st.write(f"{len(segment_timings)} fits, {len(failed)} failed, "
+             f"total fit time {segment_timings['Seconds'].sum():.1f} s")
+    st.write("Segment Forecasts:", segment_forecasts)
+    st.write("Fit Timings:", segment_timings)
+
+
+# Backtest rolling-origin: evaluasi model dari banyak origin dan horizon
+@st.cache_data
+def backtest_metrics(data):
+    _, metrics = rolling_backtest(data, max_horizon=future_steps)
+    return metrics
+
+if st.checkbox("Run rolling-origin backtest"):
+    st.write("Sales Backtest:", backtest_metrics(monthly_sales))
+    st.write("Profit Backtest:", backtest_metrics(monthly_profit))
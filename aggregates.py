@@ -0,0 +1,248 @@
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+# Akurasi relatif sketch kuantil (1% dari nilai sebenarnya)
+QUANTILE_ACCURACY = 0.01
+
+# Jumlah bit index register HyperLogLog (2^12 register, galat standar sekitar 1.6%)
+DISTINCT_PRECISION = 12
+
+# Rentang precision yang diterima: minimal 12 agar sisa bit hash tepat sebagai
+# float64, maksimal 18 (2^18 register = 256 KB per sketch)
+DISTINCT_PRECISION_RANGE = (12, 18)
+
+
+# Jumlah terkompensasi (Neumaier): setiap bagian dijumlahkan dengan math.fsum
+# dan galat pembulatan saat penggabungan disimpan di `compensation`, jadi hasil
+# tidak bergantung pada urutan chunk. count bisa berupa jumlah baris atau
+# jumlah kolom bobot (mis. Transactions pada sel cube)
+class SumState:
+    def __init__(self, count=0, total=0.0, compensation=0.0):
+        self.count = count
+        self.total = total
+        self.compensation = compensation
+
+    @classmethod
+    def from_values(cls, values, weights=None):
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        count = len(values) if weights is None else int(np.asarray(weights).sum())
+        return cls(count, math.fsum(values.tolist()))
+
+    def merge(self, other):
+        total = self.total + other.total
+        if abs(self.total) >= abs(other.total):
+            error = (self.total - total) + other.total
+        else:
+            error = (other.total - total) + self.total
+        return SumState(self.count + other.count, total, self.compensation + other.compensation + error)
+
+    @property
+    def sum(self):
+        return self.total + self.compensation
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else float("nan")
+
+
+# Nilai minimum dan maksimum
+class MinMaxState:
+    def __init__(self, minimum=math.inf, maximum=-math.inf):
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @classmethod
+    def from_values(cls, values):
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return cls()
+        return cls(float(values.min()), float(values.max()))
+
+    def merge(self, other):
+        return MinMaxState(min(self.minimum, other.minimum), max(self.maximum, other.maximum))
+
+
+# Sketch kuantil dengan galat relatif tetap (seperti DDSketch): setiap nilai
+# masuk ke bucket logaritmik, jadi dua sketch digabung cukup dengan menjumlahkan
+# jumlah per bucket. Ukuran sketch bergantung pada rentang nilai, bukan jumlah baris
+class QuantileSketch:
+    def __init__(self, accuracy=QUANTILE_ACCURACY, positive=None, negative=None, zeros=0):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.positive = positive or {}
+        self.negative = negative or {}
+        self.zeros = zeros
+
+    # Fungsi untuk menghitung jumlah nilai per bucket log_gamma(|x|)
+    def _buckets(self, values):
+        keys, counts = np.unique(np.ceil(np.log(values) / math.log(self.gamma)).astype("int64"), return_counts=True)
+        return dict(zip(keys.tolist(), counts.tolist()))
+
+    @classmethod
+    def from_values(cls, values, accuracy=QUANTILE_ACCURACY):
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        sketch = cls(accuracy)
+        sketch.positive = sketch._buckets(values[values > 0])
+        sketch.negative = sketch._buckets(-values[values < 0])
+        sketch.zeros = int((values == 0).sum())
+        return sketch
+
+    def merge(self, other):
+        if other.accuracy != self.accuracy:
+            raise ValueError("cannot merge quantile sketches with different accuracy")
+        positive, negative = dict(self.positive), dict(self.negative)
+        for key, count in other.positive.items():
+            positive[key] = positive.get(key, 0) + count
+        for key, count in other.negative.items():
+            negative[key] = negative.get(key, 0) + count
+        return QuantileSketch(self.accuracy, positive, negative, self.zeros + other.zeros)
+
+    @property
+    def count(self):
+        return sum(self.positive.values()) + sum(self.negative.values()) + self.zeros
+
+    # Fungsi untuk memperkirakan kuantil q (0..1)
+    def quantile(self, q):
+        count = self.count
+        if not count:
+            return float("nan")
+        rank = q * (count - 1)
+        # Urutan naik: negatif (|x| terbesar dulu), nol, lalu positif
+        buckets = [(-self._value(key), n) for key, n in sorted(self.negative.items(), reverse=True)]
+        buckets += [(0.0, self.zeros)]
+        buckets += [(self._value(key), n) for key, n in sorted(self.positive.items())]
+        seen = 0
+        for value, n in buckets:
+            seen += n
+            if seen > rank:
+                return value
+        return buckets[-1][0]
+
+    # Fungsi untuk nilai wakil satu bucket (galat relatif <= accuracy)
+    def _value(self, key):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+
+# Perkiraan jumlah nilai unik (HyperLogLog). Register digabung dengan maksimum
+# per register, jadi hasil gabungan sama dengan sketch dari semua nilai sekaligus
+class DistinctSketch:
+    def __init__(self, precision=DISTINCT_PRECISION, registers=None):
+        low, high = DISTINCT_PRECISION_RANGE
+        if not isinstance(precision, int) or not low <= precision <= high:
+            raise ValueError(f"distinct sketch precision must be an integer from {low} to {high}, got {precision!r}")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype="uint8") if registers is None else registers
+
+    @classmethod
+    def from_values(cls, values, precision=DISTINCT_PRECISION):
+        sketch = cls(precision)
+        values = pd.Series(values).dropna()
+        if not len(values):
+            return sketch
+        hashes = pd.util.hash_pandas_object(values, index=False).values
+        index = (hashes >> np.uint64(64 - precision)).astype("int64")
+        # Sisa bit (64 - precision <= 52 bit) masih tepat sebagai float64
+        rest_bits = 64 - precision
+        rest = (hashes & np.uint64((1 << rest_bits) - 1)).astype("float64")
+        rank = np.where(rest > 0, rest_bits - np.floor(np.log2(np.maximum(rest, 1))), rest_bits + 1)
+        np.maximum.at(sketch.registers, index, rank.astype("uint8"))
+        return sketch
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("cannot merge distinct sketches with different precision")
+        return DistinctSketch(self.precision, np.maximum(self.registers, other.registers))
+
+    # Fungsi untuk memperkirakan jumlah nilai unik
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(2.0 ** -self.registers.astype("float64"))
+        empty = int((self.registers == 0).sum())
+        # Koreksi rentang kecil (linear counting)
+        if raw <= 2.5 * m and empty:
+            return m * math.log(m / empty)
+        return raw
+
+
+# Kumpulan state per kolom untuk satu bagian data (chunk, partisi, atau sel cube
+# yang lolos filter). Dua AggregateState digabung dengan merge(), dan hasil
+# gabungan tidak bergantung pada urutan atau cara data dibagi
+class AggregateState:
+    def __init__(self, sums=None, extremes=None, quantiles=None, distinct=None):
+        self.sums = sums or {}
+        self.extremes = extremes or {}
+        self.quantiles = quantiles or {}
+        self.distinct = distinct or {}
+
+    # Fungsi untuk membuat state dari DataFrame. count_column (mis. "Transactions")
+    # dipakai sebagai bobot jumlah baris jika data sudah berupa agregat
+    @classmethod
+    def from_frame(cls, df, sums=(), extremes=(), quantiles=(), distinct=(), count_column=None):
+        weights = None if count_column is None else df[count_column]
+        return cls(
+            sums={column: SumState.from_values(df[column], weights) for column in sums},
+            extremes={column: MinMaxState.from_values(df[column]) for column in extremes},
+            quantiles={column: QuantileSketch.from_values(df[column]) for column in quantiles},
+            distinct={column: DistinctSketch.from_values(df[column]) for column in distinct},
+        )
+
+    def merge(self, other):
+        def merge_states(a, b):
+            merged = dict(a)
+            for column, state in b.items():
+                merged[column] = merged[column].merge(state) if column in merged else state
+            return merged
+
+        return AggregateState(
+            sums=merge_states(self.sums, other.sums),
+            extremes=merge_states(self.extremes, other.extremes),
+            quantiles=merge_states(self.quantiles, other.quantiles),
+            distinct=merge_states(self.distinct, other.distinct),
+        )
+
+    # Fungsi untuk meringkas state menjadi angka biasa (mis. untuk JSON)
+    def summary(self, quantiles=(0.5, 0.9, 0.99)):
+        result = {}
+        for column, state in self.sums.items():
+            result[column] = {"count": state.count, "sum": state.sum, "mean": state.mean}
+        for column, state in self.extremes.items():
+            result.setdefault(column, {}).update(min=state.minimum, max=state.maximum)
+        for column, sketch in self.quantiles.items():
+            result.setdefault(column, {}).update({f"p{round(q * 100)}": sketch.quantile(q) for q in quantiles})
+        for column, sketch in self.distinct.items():
+            result.setdefault(column, {})["distinct"] = round(sketch.estimate())
+        return result
+
+
+# Fungsi untuk menggabungkan banyak state menjadi satu
+def combine(states):
+    return reduce(lambda a, b: a.merge(b), states, AggregateState())
+
+
+# Fungsi untuk menghitung state per chunk secara paralel (numpy dan hashing
+# melepas GIL untuk sebagian besar pekerjaannya) lalu menggabungkannya. Paling
+# banyak 2 chunk per worker yang dibaca lebih dulu, jadi memori tetap terbatas
+def summarize_chunks(chunks, prepare=None, max_workers=None, **spec):
+    def summarize(chunk):
+        if prepare is not None:
+            chunk = prepare(chunk)
+        return AggregateState.from_frame(chunk, **spec)
+
+    workers = max_workers or os.cpu_count() or 1
+    state, pending = AggregateState(), set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for chunk in chunks:
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                state = combine([state] + [future.result() for future in done])
+            pending.add(executor.submit(summarize, chunk))
+        return combine([state] + [future.result() for future in pending])
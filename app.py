@@ -1,27 +1,41 @@
-import pandas as pd  # pip install pandas openpyxl --user
-import numpy as np  # pip install numpy 
-import plotly.express as px # pip install plotly-express --user
-import plotly.graph_objects as go
 import streamlit as st  # pip install streamlit --user
+from hot_reload import LiveCube, LiveSharedCube, LiveSqlCube, rerun_on_change
+from pipelines import (
+    SALES_FILE,
+    SALES_FILTERS,
+    build_sales_cube,
+    build_sales_sql_cube,
+    clean_sales,
+    load_sales_data,
+    load_shared_sales,
+    read_sales_rows,
+    sales_kpis,
+)
+from profiling import RerunProfiler, render_diagnostics
+from shared_store import use_shared
+from sql_backend import sql_engine
 
 st.set_page_config(page_title="Sales Dashboard", layout="wide")
 
-# ---- READ EXCEL ----
-@st.cache_data
-def get_data_from_excel():
-    df = pd.read_excel(
-        io="supermarkt_sales.xlsx",
-        engine="openpyxl",
-        sheet_name="Sales",
-        skiprows=3,
-        usecols="B:R",
-        nrows=1000,
-    )
-    # Add 'hour' column to dataframe
-    df["hour"] = pd.to_datetime(df["Time"], format="%H:%M:%S").dt.hour
-    return df
+# Waktu dan memori setiap tahap rerun, ditampilkan di sidebar "Diagnostics"
+profiler = RerunProfiler("sales")
 
-df = get_data_from_excel()
+# ---- READ EXCEL ----
+# Cube dibuat sekali per proses: semua filter dan chart dijawab dari sel cube.
+# File sumber dipantau dan cube diperbarui inkremental saat file berubah.
+# Dengan DASHBOARD_BACKEND=duckdb/sqlite, filter dan agregasi dijalankan sebagai SQL;
+# dengan DASHBOARD_SHARED=1, baris bersih di-map dari file Arrow bersama
+@st.cache_resource
+def get_live_cube():
+    if sql_engine() is not None:
+        return LiveSqlCube(SALES_FILE, build_sales_sql_cube).start_watching()
+    if use_shared():
+        return LiveSharedCube(SALES_FILE, load_shared_sales, build_sales_cube).start_watching()
+    return LiveCube(SALES_FILE, read_sales_rows, clean_sales, build_sales_cube, load_sales_data).start_watching()
+
+live_cube = get_live_cube()
+cube = live_cube.cube
+profiler.lap("load")
 
 # # ---- SIDEBAR ----
 # st.sidebar.header("Please Filter Here:")
@@ -55,30 +69,36 @@ df = get_data_from_excel()
 # ---- SIDEBAR ----
 st.sidebar.header("Please Filter Here:")
 
-all_cities = df["City"].unique()
+all_cities = cube.values("City")
 city_selection = st.sidebar.checkbox("Select All Cities", value=True)
 if city_selection:
     selected_cities = all_cities
 else:
     selected_cities = st.sidebar.multiselect("Select the City:", options=all_cities, default=all_cities)
 
-all_customer_types = df["Customer_type"].unique()
+all_customer_types = cube.values("Customer_type")
 customer_type_selection = st.sidebar.checkbox("Select All Customer Types", value=True)
 if customer_type_selection:
     selected_customer_types = all_customer_types
 else:
     selected_customer_types = st.sidebar.multiselect("Select the Customer Type:", options=all_customer_types, default=all_customer_types)
 
-all_genders = df["Gender"].unique()
+all_genders = cube.values("Gender")
 gender_selection = st.sidebar.checkbox("Select All Genders", value=True)
 if gender_selection:
     selected_genders = all_genders
 else:
     selected_genders = st.sidebar.multiselect("Select the Gender:", options=all_genders, default=all_genders)
 
-df_selection = df.query(
-    "City in @selected_cities & Customer_type in @selected_customer_types & Gender in @selected_genders"
-)
+profiler.lap("sidebar")
+
+selections = {
+    "City": selected_cities,
+    "Customer_type": selected_customer_types,
+    "Gender": selected_genders,
+}
+with profiler.stage("filter"):
+    df_selection = cube.select(selections)
 
 # Check if the dataframe is empty:
 if df_selection.empty:
@@ -90,11 +110,10 @@ st.title("Sales Dashboard")
 st.markdown("##")
 
 # TOP KPI's
-total_sales = int(df_selection["Total"].sum())
-total_sales = total_sales * 16500
-average_sale_by_transaction = int(round(df_selection["Total"].mean()))
-average_sale_by_transaction = average_sale_by_transaction * 16500
-average_rating = round(df_selection["Rating"].mean(), 1)
+kpis = sales_kpis(df_selection)
+total_sales = kpis["total_sales"]
+average_sale_by_transaction = kpis["average_sale_by_transaction"]
+average_rating = kpis["average_rating"]
 star_rating = ":star:" * int(round(average_rating, 0))
 
 
@@ -108,6 +127,7 @@ with middle_column:
 with right_column:
     st.subheader("Average Rating:")
     st.subheader(f"{int(average_rating)}/10 {star_rating}")
+profiler.lap("kpi")
 
 st.markdown("""---""")
 
@@ -127,145 +147,31 @@ st.markdown("""---""")
 #     xaxis=(dict(showgrid=False))
 # )
 
-# SALES BY PRODUCT LINE [BAR CHART]
-sales_by_product_city = df_selection.groupby(by=["Product line", "City"])[["Total"]].sum().reset_index()
-fig_product_sales = px.bar(
-    sales_by_product_city,
-    x="Total",
-    y="Product line",
-    orientation="h",
-    title="<b>Sales by Product Line</b>",
-    color="City",
-    template="plotly_white",
-)
-# Mengubah font dan ukuran judul
-fig_product_sales.update_layout(
-    title={
-        'text': "<b>Sales by Product Line</b>",
-        'y': 0.9,
-        'x': 0.5,
-        'xanchor': 'center',
-        'yanchor': 'top',
-        'font': {
-            'size': 24,  # Ukuran font
-            'family': 'Arial, sans-serif',  # Font yang digunakan
-        }
-    },
-    plot_bgcolor="rgba(0,0,0,0)",
-    xaxis=dict(showgrid=False)
-)
-
-# # SALES BY HOUR [LINE CHART]
-# sales_by_hour = df_selection.groupby(by=["hour"])[["Total"]].sum().reset_index()
-# fig_hourly_sales = px.line(
-#     sales_by_hour,
-#     x=sales_by_hour.index,
-#     y="Total",
-#     title="<b>Sales by Hour</b>",
-#     color_discrete_sequence=["#0027B8"] * len(sales_by_hour),
-#     template="plotly_white",
-# )
-# fig_hourly_sales.update_layout(
-#     xaxis=dict(tickmode="linear"),
-#     plot_bgcolor="rgba(0,0,0,0)",
-#     yaxis=(dict(showgrid=False)),
-# )
-
-# SALES BY HOUR [LINE CHART]
-sales_by_hour_city = df_selection.groupby(by=["hour", "City"])[["Total"]].sum().reset_index()
-fig_hourly_sales = px.line(
-    sales_by_hour_city,
-    x="hour",
-    y="Total",
-    title="<b>Sales by Hour</b>",
-    color="City",
-    template="plotly_white",
-)
-# Mengubah font dan ukuran judul
-fig_hourly_sales.update_layout(
-    title={
-        'text': "<b>Sales by Hour</b>",
-        'y': 0.9,
-        'x': 0.5,
-        'xanchor': 'center',
-        'yanchor': 'top',
-        'font': {
-            'size': 24,  # Ukuran font
-            'family': 'Arial, sans-serif',  # Font yang digunakan
-        }
-    },
-    plot_bgcolor="rgba(0,0,0,0)",
-    xaxis=dict(showgrid=False)
-)
-
-left_column, right_column = st.columns(2)
-left_column.plotly_chart(fig_hourly_sales, use_container_width=True)
-right_column.plotly_chart(fig_product_sales, use_container_width=True)
+# Modul chart (plotly) baru diimpor setelah KPI tampil, jadi KPI tidak menunggu import-nya
+from charts import SALES_CHARTS
+from figures import chart_registry
 
-# SALES BY PAYMENT [BAR CHART]
-sales_by_payment = df_selection.groupby(by=["Payment","City"])[["Total"]].sum().reset_index()
-fig_payment_sales = px.bar(
-    sales_by_payment,
-    x="Payment",
-    y="Total",
-    color="City",
-    title="<b>Sales by Payment</b>",
-    barmode="group",
-    template="plotly_white",
-)
-# fig_payment_sales.update_layout(
-#     xaxis=dict(tickmode="linear"),
-#     plot_bgcolor="rgba(0,0,0,0)",
-#     yaxis=dict(showgrid=False),
-# )
-# Mengubah font dan ukuran judul
-fig_payment_sales.update_layout(
-    title={
-        'text': "<b>Sales by Payment</b>",
-        'y': 0.9,
-        'x': 0.5,
-        'xanchor': 'center',
-        'yanchor': 'top',
-        'font': {
-            'size': 24,  # Ukuran font
-            'family': 'Arial, sans-serif',  # Font yang digunakan
-        }
-    },
-    plot_bgcolor="rgba(0,0,0,0)",
-    xaxis=dict(showgrid=False)
-)
+# Figure dibangun dari sel cube lewat registry chart (definisi chart ada di
+# charts.py): setiap chart menyatakan filter yang dipakainya dan figure-nya
+# di-cache, jadi rerun tanpa perubahan input chart tidak membangun ulang figure
+charts = chart_registry("sales")
+for chart_id, chart in SALES_CHARTS.items():
+    charts.register(chart_id, SALES_FILTERS, chart)
 
-# SALES BY CITY [PIE CHART]
-sales_by_City = df_selection.groupby(by=["City"])[["Total"]].sum()
-fig_City_sales = px.pie(
-    sales_by_City,
-    values="Total",
-    names=sales_by_City.index,
-    title="<b>Sales by City</b>",
-    template="plotly_white",
-)
-# Mengubah font dan ukuran judul
-fig_City_sales.update_layout(
-    title={
-        'text': "<b>Sales by City</b>",
-        'y': 0.9,
-        'x': 0.5,
-        'xanchor': 'center',
-        'yanchor': 'top',
-        'font': {
-            'size': 24,  # Ukuran font
-            'family': 'Arial, sans-serif',  # Font yang digunakan
-        }
-    },
-    plot_bgcolor="rgba(0,0,0,0)",
-)
+with profiler.stage("figure build"):
+    fig_product_sales = charts.figure("product_sales", cube, selections)
+    fig_hourly_sales = charts.figure("hourly_sales", cube, selections)
+    fig_payment_sales = charts.figure("payment_sales", cube, selections)
+    fig_City_sales = charts.figure("city_sales", cube, selections)
 
-# Mengatur posisi teks pada pie chart
-fig_City_sales.update_traces(textposition="inside", textinfo="percent+label")
+with profiler.stage("render"):
+    left_column, right_column = st.columns(2)
+    left_column.plotly_chart(fig_hourly_sales, use_container_width=True)
+    right_column.plotly_chart(fig_product_sales, use_container_width=True)
 
-left_column, right_column = st.columns(2)
-left_column.plotly_chart(fig_payment_sales, use_container_width=True)
-right_column.plotly_chart(fig_City_sales, use_container_width=True)
+    left_column, right_column = st.columns(2)
+    left_column.plotly_chart(fig_payment_sales, use_container_width=True)
+    right_column.plotly_chart(fig_City_sales, use_container_width=True)
 
 # ---- HIDE STREAMLIT STYLE ----
 hide_st_style = """
@@ -276,3 +182,9 @@ hide_st_style = """
             </style>
             """
 st.markdown(hide_st_style, unsafe_allow_html=True)
+
+# ---- HOT RELOAD ----
+rerun_on_change(live_cube, live_cube.version)
+
+# ---- DIAGNOSTICS ----
+render_diagnostics(profiler)
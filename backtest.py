@@ -0,0 +1,87 @@
+import os
+import warnings
+from concurrent.futures import as_completed
+
+import numpy as np
+import pandas as pd
+
+from forecasting import limited_process_pool
+from model_store import load_or_fit
+
+
+# Fungsi worker: backtest satu blok origin yang berurutan. Model hanya di-fit
+# sekali di origin pertama blok, origin berikutnya memakai state filter yang
+# diperpanjang dengan observasi baru (results.extend) tanpa fit ulang
+def _backtest_block(series, origins, max_horizon, order, seasonal_order, alpha):
+    rows = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        results = load_or_fit(series[:origins[0]], order, seasonal_order, incremental=False)
+        previous = origins[0]
+        for origin in origins:
+            if origin > previous:
+                results = results.extend(series[previous:origin])
+                previous = origin
+            steps = min(max_horizon, len(series) - origin)
+            forecast = results.get_forecast(steps=steps)
+            predicted = forecast.predicted_mean.values
+            conf_int = forecast.conf_int(alpha=alpha).values
+            for h in range(steps):
+                rows.append({
+                    "Origin": series.index[origin - 1],
+                    "Horizon": h + 1,
+                    "Actual": series.iloc[origin + h],
+                    "Predicted": predicted[h],
+                    "Lower": conf_int[h, 0],
+                    "Upper": conf_int[h, 1],
+                })
+    return rows
+
+
+# Fungsi untuk merangkum hasil backtest menjadi metrik per horizon
+def summarize_backtest(predictions):
+    error = predictions["Predicted"] - predictions["Actual"]
+    actual = predictions["Actual"].where(predictions["Actual"] != 0)
+    frame = predictions.assign(
+        AbsError=error.abs(),
+        SquaredError=error ** 2,
+        AbsPercentError=(error / actual).abs() * 100,
+        Covered=(predictions["Actual"] >= predictions["Lower"]) & (predictions["Actual"] <= predictions["Upper"]),
+    )
+    metrics = frame.groupby("Horizon").agg(
+        Forecasts=("AbsError", "size"),
+        MAE=("AbsError", "mean"),
+        RMSE=("SquaredError", "mean"),
+        MAPE=("AbsPercentError", "mean"),
+        Coverage=("Covered", "mean"),
+    )
+    metrics["RMSE"] = np.sqrt(metrics["RMSE"])
+    return metrics.reset_index()
+
+
+# Fungsi untuk backtest rolling-origin: model dievaluasi dari banyak origin
+# (default: dari separuh deret sampai akhir) untuk horizon 1..max_horizon.
+# Origin dibagi menjadi blok-blok berurutan yang dikerjakan paralel; setiap blok
+# hanya fit sekali. Mengembalikan (predictions, metrics)
+def rolling_backtest(series, order=(1, 1, 1), seasonal_order=(1, 1, 1, 12), max_horizon=12,
+                     min_train=None, step=1, alpha=0.05, max_workers=None, blocks=None):
+    min_train = min_train or max(len(series) // 2, 2)
+    origins = list(range(min_train, len(series), step))
+    if not origins:
+        raise ValueError("Series is too short for the requested min_train")
+
+    blocks = min(blocks or max_workers or os.cpu_count(), len(origins))
+    rows = []
+    with limited_process_pool(max_workers) as executor:
+        futures = [
+            executor.submit(_backtest_block, series, [int(o) for o in block], max_horizon, order, seasonal_order, alpha)
+            for block in np.array_split(origins, blocks)
+        ]
+        for future in as_completed(futures):
+            rows.extend(future.result())
+
+    predictions = pd.DataFrame(rows).sort_values(["Origin", "Horizon"], ignore_index=True)
+    metrics = summarize_backtest(predictions)
+    metrics.insert(0, "Order", str(tuple(order)))
+    metrics.insert(1, "Seasonal Order", str(tuple(seasonal_order)))
+    return predictions, metrics
@@ -0,0 +1,298 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from data_loader import read_table
+from olap_cube import rollup
+from pipelines import (
+    FINANCIAL_READ_KWARGS,
+    SALES_READ_KWARGS,
+    build_financial_cube,
+    build_sales_cube,
+    clean_financial,
+    clean_sales,
+    load_financial_data,
+    load_sales_data,
+)
+
+# Jumlah baris maksimal per sheet Excel (dikurangi 4 baris header supermarkt_sales.xlsx)
+EXCEL_MAX_ROWS = 1_048_576 - 4
+
+# Di atas jumlah baris ini pipeline memakai mode streaming (agregat per chunk)
+FULL_LOAD_MAX_ROWS = 1_000_000
+
+# Jumlah baris sintetis yang dibuat per chunk saat menulis file
+GENERATE_CHUNK = 1_000_000
+
+CITIES = {"A": "Jakarta", "B": "Surabaya", "C": "Bandung"}
+PRODUCT_LINES = ["Health and beauty", "Electronic accessories", "Home and lifestyle",
+                 "Sports and travel", "Food and beverages", "Fashion accessories"]
+SEGMENTS = ["Government", "Midmarket", "Channel Partners", "Enterprise", "Small Business"]
+COUNTRIES = ["Canada", "Germany", "France", "Mexico", "United States of America"]
+PRODUCTS = ["Carretera", "Montana", "Paseo", "Velo", "VTT", "Amarilla"]
+DISCOUNT_BANDS = ["None", "Low", "Medium", "High"]
+
+
+# ---- DATA SINTETIS ----
+# Fungsi untuk membuat baris sintetis dengan skema supermarkt_sales.xlsx (kolom B:R)
+def synthetic_sales(n, rng, start=0):
+    branch = rng.choice(list(CITIES), n)
+    unit_price = rng.uniform(10, 100, n).round(2)
+    quantity = rng.integers(1, 11, n)
+    tax = (0.05 * unit_price * quantity).round(4)
+    seconds = rng.integers(10 * 3600, 21 * 3600, n)
+    return pd.DataFrame({
+        "Invoice ID": [f"{i:011d}" for i in range(start, start + n)],
+        "Branch": branch,
+        "City": pd.Series(branch).map(CITIES).values,
+        "Customer_type": rng.choice(["Member", "Normal"], n),
+        "Gender": rng.choice(["Male", "Female"], n),
+        "Product line": rng.choice(PRODUCT_LINES, n),
+        "Unit price": unit_price,
+        "Quantity": quantity,
+        "Tax 5%": tax,
+        "Total": (unit_price * quantity + tax).round(4),
+        "Date": pd.Timestamp("2019-01-01") + pd.to_timedelta(rng.integers(0, 90, n), unit="D"),
+        "Time": pd.to_timedelta(seconds, unit="s").astype(str).str[-8:],
+        "Payment": rng.choice(["Cash", "Credit card", "Ewallet"], n),
+        "cogs": (unit_price * quantity).round(2),
+        "gross margin percentage": 4.761905,
+        "gross income": tax,
+        "Rating": rng.uniform(4, 10, n).round(1),
+    })
+
+
+# Fungsi untuk membuat baris sintetis dengan skema financial_sample.xlsx. Profit
+# ditulis sebagai teks format akuntansi: rugi dalam kurung, nol sebagai "-"
+def synthetic_financial(n, rng, start=0):
+    units = rng.integers(200, 5000, n)
+    manufacturing_price = rng.choice([3, 5, 10, 120, 250, 260], n)
+    sale_price = rng.choice([7, 12, 15, 20, 125, 300, 350], n)
+    gross_sales = units * sale_price
+    discounts = (gross_sales * rng.choice([0, 0.01, 0.05, 0.1], n)).round(2)
+    sales = gross_sales - discounts
+    cogs = units * manufacturing_price
+    profit = (sales - cogs).round(2)
+    date = pd.DatetimeIndex(pd.date_range("2010-01-01", periods=60, freq="MS")[rng.integers(0, 60, n)])
+    return pd.DataFrame({
+        "Segment": rng.choice(SEGMENTS, n),
+        "Country": rng.choice(COUNTRIES, n),
+        "Product": rng.choice(PRODUCTS, n),
+        "Discount Band": rng.choice(DISCOUNT_BANDS, n),
+        "Units Sold": units,
+        "Manufacturing Price": manufacturing_price,
+        "Sale Price": sale_price,
+        "Gross Sales": gross_sales,
+        "Discounts": np.where(discounts == 0, "-", discounts.astype(str)),
+        "Sales": sales,
+        "COGS": cogs,
+        "Profit": np.where(profit < 0, "(" + np.abs(profit).astype(str) + ")",
+                           np.where(profit == 0, "-", profit.astype(str))),
+        "Date": date,
+        "Month Number": date.month,
+        "Month": date.month_name(),
+        "Year": date.year,
+    })
+
+
+# Fungsi untuk menulis dataset sintetis per chunk ke .parquet atau .xlsx
+def write_dataset(kind, n, fmt, folder, seed=0):
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{kind}-{n}.{fmt}")
+    if os.path.exists(path):
+        return path
+    generate = synthetic_sales if kind == "sales" else synthetic_financial
+    rng = np.random.default_rng(seed)
+
+    if fmt == "xlsx":
+        if n > EXCEL_MAX_ROWS:
+            raise ValueError(f"{n} rows do not fit in one Excel sheet, use --format parquet")
+        df = generate(n, rng)
+        with pd.ExcelWriter(path, engine="openpyxl") as writer:
+            if kind == "sales":
+                # Sama dengan supermarkt_sales.xlsx: 3 baris kosong di atas dan data mulai di kolom B
+                df.to_excel(writer, sheet_name="Sales", startrow=3, startcol=1, index=False)
+            else:
+                df.to_excel(writer, sheet_name="Sales", index=False)
+        return path
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    writer = None
+    try:
+        for start in range(0, n, GENERATE_CHUNK):
+            table = pa.Table.from_pandas(generate(min(GENERATE_CHUNK, n - start), rng, start), preserve_index=False)
+            writer = writer or pq.ParquetWriter(path + ".tmp", table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(path + ".tmp", path)
+    return path
+
+
+# ---- PENGUKURAN ----
+# Pencatat waktu dan memori per tahap pipeline. Memori puncak diukur dengan
+# tracemalloc (alokasi Python dan numpy) sejak awal tahap
+class StageRecorder:
+    def __init__(self):
+        self.results = []
+
+    @contextmanager
+    def stage(self, dataset, rows, fmt, mode, name):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        self.results.append({
+            "dataset": dataset,
+            "rows": rows,
+            "format": fmt,
+            "mode": mode,
+            "stage": name,
+            "seconds": round(seconds, 6),
+            "peak_memory_bytes": int(peak),
+        })
+        print(f"{dataset:>9} {rows:>11,} {mode:>6} {name:<14} {seconds:9.3f} s {peak / 2**20:10.1f} MiB")
+
+
+# Fungsi untuk mengukur chart dashboard dari definisi chart yang sama (charts.py):
+# filter sel cube, tabel setiap chart, figure plotly (tema dan downsampling), dan
+# figure yang diambil dari cache ChartRegistry pada rerun tanpa perubahan filter
+def bench_charts(charts, cube, selections, stage):
+    from figures import ChartRegistry
+
+    with stage("filter"):
+        selection = cube.select(selections)
+    with stage("rollup"):
+        tables = {chart_id: chart.aggregate(selection) for chart_id, chart in charts.items()}
+    with stage("figure build"):
+        [charts[chart_id].figure(table).to_json() for chart_id, table in tables.items()]
+
+    registry = ChartRegistry()
+    for chart_id, chart in charts.items():
+        registry.register(chart_id, list(selections), chart)
+        registry.figure(chart_id, cube, selections)
+    with stage("figure cache"):
+        [registry.figure(chart_id, cube, selections) for chart_id in charts]
+
+
+# Fungsi untuk mengukur pipeline app.py
+def bench_sales(path, n, fmt, recorder):
+    streaming = n > FULL_LOAD_MAX_ROWS
+    mode = "stream" if streaming else "full"
+    stage = lambda name: recorder.stage("sales", n, fmt, mode, name)
+    if streaming:
+        with stage("load+clean"):
+            data = load_sales_data(path, streaming=True)
+    else:
+        with stage("load"):
+            rows = read_table(path, engine="openpyxl", **SALES_READ_KWARGS)
+        with stage("clean"):
+            data = clean_sales(rows)
+        del rows
+    with stage("group-by"):
+        cube = build_sales_cube(data)
+    del data
+    from charts import SALES_CHARTS
+    bench_charts(SALES_CHARTS, cube, {"City": [cube.values("City")[0]]}, stage)
+
+
+# Fungsi untuk mengukur pipeline streamlit_app.py dan Prediction_Financial.py
+def bench_financial(path, n, fmt, recorder, forecast=True):
+    streaming = n > FULL_LOAD_MAX_ROWS
+    mode = "stream" if streaming else "full"
+    stage = lambda name: recorder.stage("financial", n, fmt, mode, name)
+    if streaming:
+        with stage("load+clean"):
+            data = load_financial_data(path, streaming=True)
+    else:
+        with stage("load"):
+            rows = read_table(path, **FINANCIAL_READ_KWARGS)
+        with stage("clean"):
+            data = clean_financial(rows)
+        del rows
+    with stage("group-by"):
+        cube = build_financial_cube(data)
+    del data
+    from charts import FINANCIAL_CHARTS
+    bench_charts(FINANCIAL_CHARTS, cube, {"Country": [cube.values("Country")[0]]}, stage)
+
+    if forecast:
+        import warnings
+        from statsmodels.tsa.statespace.sarimax import SARIMAX
+        stage = lambda name: recorder.stage("forecast", n, fmt, mode, name)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            monthly_sales = rollup(cube.cells, ["Date"], ["Sales"]).set_index("Date")["Sales"].resample('M').sum()
+            train = monthly_sales[:int(0.8 * len(monthly_sales))]
+            with stage("SARIMAX fit"):
+                results = SARIMAX(train, order=(1, 1, 1), seasonal_order=(1, 1, 1, 12)).fit(disp=False)
+            with stage("forecast"):
+                prediction = results.get_forecast(steps=12)
+                prediction.conf_int()
+
+
+# Fungsi untuk mengambil commit git saat ini (jika ada)
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard pipelines on synthetic data.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="dataset sizes, e.g. --rows 1000 1000000 100000000")
+    parser.add_argument("--format", choices=["parquet", "xlsx"], default="parquet")
+    parser.add_argument("--datasets", nargs="+", choices=["sales", "financial"], default=["sales", "financial"])
+    parser.add_argument("--no-forecast", action="store_true", help="skip the SARIMAX fit and forecast stages")
+    parser.add_argument("--data-dir", default=".benchmark_data")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    recorder = StageRecorder()
+    tracemalloc.start()
+    for n in args.rows:
+        for dataset in args.datasets:
+            path = write_dataset(dataset, n, args.format, args.data_dir, args.seed)
+            if dataset == "sales":
+                bench_sales(path, n, args.format, recorder)
+            else:
+                bench_financial(path, n, args.format, recorder, forecast=not args.no_forecast)
+    tracemalloc.stop()
+
+    report = {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        },
+        "results": recorder.results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
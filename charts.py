@@ -0,0 +1,239 @@
+import plotly.express as px
+
+from data_loader import correlation_from_moments
+from downsample import downsample_frame, render_mode
+from figures import DARK_THEME, LIGHT_THEME
+from olap_cube import rollup
+from pipelines import CORRELATION_COLUMNS
+
+
+# Definisi chart dashboard, terpisah dari UI Streamlit supaya bisa dipakai oleh
+# halaman dashboard (lewat ChartRegistry) maupun export_reports.py. Setiap chart
+# terdiri dari aggregate(cells) -> tabel dan figure(tabel) -> figure plotly
+class Chart:
+    def __init__(self, aggregate, figure):
+        self.aggregate = aggregate
+        self.figure = figure
+
+    # Fungsi untuk membangun figure langsung dari sel cube (dipakai ChartRegistry)
+    def __call__(self, cells, **params):
+        return self.figure(self.aggregate(cells, **params))
+
+
+# ---- SALES DASHBOARD (app.py) ----
+# SALES BY PRODUCT LINE [BAR CHART]
+def product_line_sales(cells):
+    return rollup(cells, ["Product line", "City"], ["Total"])
+
+
+def product_line_sales_figure(sales_by_product_city):
+    return px.bar(
+        sales_by_product_city,
+        x="Total",
+        y="Product line",
+        orientation="h",
+        title="<b>Sales by Product Line</b>",
+        color="City",
+        template=LIGHT_THEME,
+    )
+
+
+# SALES BY HOUR [LINE CHART]
+def hourly_sales(cells):
+    return rollup(cells, ["hour", "City"], ["Total"])
+
+
+def hourly_sales_figure(sales_by_hour_city):
+    sales_by_hour_city = downsample_frame(sales_by_hour_city, "hour", "Total", by="City")
+    return px.line(
+        sales_by_hour_city,
+        x="hour",
+        y="Total",
+        title="<b>Sales by Hour</b>",
+        color="City",
+        template=LIGHT_THEME,
+        render_mode=render_mode(len(sales_by_hour_city)),
+    )
+
+
+# SALES BY PAYMENT [BAR CHART]
+def payment_sales(cells):
+    return rollup(cells, ["Payment", "City"], ["Total"])
+
+
+def payment_sales_figure(sales_by_payment):
+    return px.bar(
+        sales_by_payment,
+        x="Payment",
+        y="Total",
+        color="City",
+        title="<b>Sales by Payment</b>",
+        barmode="group",
+        template=LIGHT_THEME,
+    )
+
+
+# SALES BY CITY [PIE CHART]
+def city_sales(cells):
+    return rollup(cells, ["City"], ["Total"])
+
+
+def city_sales_figure(sales_by_City):
+    fig_City_sales = px.pie(
+        sales_by_City,
+        values="Total",
+        names="City",
+        title="<b>Sales by City</b>",
+        template=LIGHT_THEME,
+    )
+    # Mengatur posisi teks pada pie chart
+    fig_City_sales.update_traces(textposition="inside", textinfo="percent+label")
+    return fig_City_sales
+
+
+SALES_CHARTS = {
+    "product_sales": Chart(product_line_sales, product_line_sales_figure),
+    "hourly_sales": Chart(hourly_sales, hourly_sales_figure),
+    "payment_sales": Chart(payment_sales, payment_sales_figure),
+    "city_sales": Chart(city_sales, city_sales_figure),
+}
+
+
+# ---- FINANCIAL DASHBOARD (streamlit_app.py) ----
+# SALES BY PRODUCT [BAR CHART]
+def product_sales(cells):
+    return rollup(cells, ["Product", "Country"], ["Sales"])
+
+
+def product_sales_figure(sales_by_product_Country):
+    return px.bar(
+        sales_by_product_Country,
+        y="Sales",
+        x="Product",
+        # orientation="h",
+        title="<b>Sales by Product</b>",
+        color="Country",
+        template=LIGHT_THEME,
+    )
+
+
+# SALES BY MONTH [LINE CHART]
+# Tanggal di cube sudah dibulatkan ke awal bulan, jadi langsung menjadi 'Bulan'.
+# x_range (zoom) membatasi bulan yang diambil
+def monthly_sales(cells, x_range=None):
+    sales_by_month_Country = rollup(cells, ["Date", "Country"], ["Sales"]).rename(columns={"Date": "Bulan"})
+    if x_range is not None:
+        sales_by_month_Country = sales_by_month_Country[sales_by_month_Country["Bulan"].between(*x_range)]
+    return sales_by_month_Country
+
+
+# Garis dipangkas ke jumlah titik yang bisa ditampilkan sebelum dibuat figure
+def monthly_sales_figure(sales_by_month_Country):
+    sales_by_month_Country = downsample_frame(sales_by_month_Country, "Bulan", "Sales", by="Country")
+    return px.line(
+        sales_by_month_Country,
+        x="Bulan",
+        y="Sales",
+        title="<b>Sales by Month</b>",
+        color="Country",
+        template=LIGHT_THEME,
+        render_mode=render_mode(len(sales_by_month_Country)),
+    )
+
+
+# SALES BY SEGMENT [BAR CHART]
+def segment_sales(cells):
+    return rollup(cells, ["Segment", "Country"], ["Sales"])
+
+
+def segment_sales_figure(sales_by_segment):
+    return px.bar(
+        sales_by_segment,
+        x="Segment",
+        y="Sales",
+        color="Country",
+        title="<b>Sales by Segment</b>",
+        barmode="group",
+        template=LIGHT_THEME,
+    )
+
+
+# SALES BY COUNTRY [PIE CHART]
+def country_sales(cells):
+    return rollup(cells, ["Country"], ["Sales"])
+
+
+def country_sales_figure(sales_by_Country):
+    fig_Country_sales = px.pie(
+        sales_by_Country,
+        values="Sales",
+        names="Country",
+        title="<b>Sales by Country</b>",
+        template=LIGHT_THEME,
+    )
+    # Mengatur posisi teks pada pie chart
+    fig_Country_sales.update_traces(textposition="inside", textinfo="percent+label")
+    return fig_Country_sales
+
+
+# Chart bagian bawah memakai tema gelap DARK_THEME
+
+# Sales by Discount Band
+def discount_band_sales(cells):
+    grouped_discount = rollup(cells, ['Discount Band'], ['Sales'])
+    return grouped_discount.sort_values(by='Sales', ascending=False)
+
+
+def discount_band_sales_figure(grouped_discount):
+    fig = px.bar(grouped_discount, x='Discount Band', y='Sales', title='Sales by Discount Band',
+                 color_discrete_sequence=['#E694FF'], opacity=0.7, template=DARK_THEME)
+    fig.update_xaxes(showgrid=False)
+    return fig
+
+
+# Heatmap korelasi (dihitung dari jumlah hasil kali di sel cube)
+def correlation_heatmap(cells):
+    return correlation_from_moments(cells, CORRELATION_COLUMNS)
+
+
+def correlation_heatmap_figure(correlation):
+    return px.imshow(correlation, text_auto='.2f', color_continuous_scale='RdBu_r', color_continuous_midpoint=0,
+                     zmin=-1, zmax=1, title='Correlation Heatmap', template=DARK_THEME)
+
+
+# Monthly profit for each product
+# Tanggal di cube sudah dibulatkan ke awal bulan, jadi langsung menjadi 'Year-Month'
+def monthly_product_profit(cells):
+    return rollup(cells, ['Date', 'Product'], ['Profit']).rename(columns={'Date': 'Year-Month'})
+
+
+def monthly_product_profit_figure(monthly_product_profit):
+    monthly_product_profit = downsample_frame(monthly_product_profit, 'Year-Month', 'Profit', by='Product')
+    return px.line(monthly_product_profit, x='Year-Month', y='Profit', color='Product',
+                   title='Monthly Profit by Product', labels={'Year-Month': 'Date'}, template=DARK_THEME,
+                   render_mode=render_mode(len(monthly_product_profit)))
+
+
+# Pivot 'Profit' dengan 'Product' dan 'Discount Band' sebagai dimensi
+def product_discount_profit(cells):
+    return rollup(cells, ['Product', 'Discount Band'], ['Profit']).pivot(index='Product', columns='Discount Band', values='Profit')
+
+
+def product_discount_profit_figure(product_discount_profit):
+    fig = px.imshow(product_discount_profit, text_auto='.0f', color_continuous_scale='Viridis', aspect='auto',
+                    title='Profit across Products and Discount Bands', labels={'color': 'Profit'}, template=DARK_THEME)
+    fig.update_xaxes(showgrid=False)
+    fig.update_yaxes(showgrid=False)
+    return fig
+
+
+FINANCIAL_CHARTS = {
+    "product_sales": Chart(product_sales, product_sales_figure),
+    "monthly_sales": Chart(monthly_sales, monthly_sales_figure),
+    "segment_sales": Chart(segment_sales, segment_sales_figure),
+    "country_sales": Chart(country_sales, country_sales_figure),
+    "discount_band_sales": Chart(discount_band_sales, discount_band_sales_figure),
+    "correlation_heatmap": Chart(correlation_heatmap, correlation_heatmap_figure),
+    "monthly_product_profit": Chart(monthly_product_profit, monthly_product_profit_figure),
+    "product_discount_profit": Chart(product_discount_profit, product_discount_profit_figure),
+}
@@ -0,0 +1,13 @@
+import streamlit as st  # pip install streamlit --user
+
+# Satu aplikasi multipage untuk ketiga dashboard: `streamlit run dashboard.py`.
+# Setiap halaman hanya mengimpor library yang dipakainya (plotly untuk chart,
+# statsmodels dan matplotlib hanya di halaman prediksi), jadi membuka satu
+# halaman tidak membayar import halaman lain. Setiap file tetap bisa dijalankan
+# sendiri seperti sebelumnya (mis. `streamlit run app.py`)
+pages = st.navigation([
+    st.Page("app.py", title="Sales Dashboard", url_path="sales", default=True),
+    st.Page("streamlit_app.py", title="Financial Dashboard", url_path="financial"),
+    st.Page("Prediction_Financial.py", title="Financial Prediction", url_path="prediction"),
+])
+pages.run()
@@ -0,0 +1,253 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import openpyxl
+import pandas as pd  # pip install pandas openpyxl pyarrow --user
+from openpyxl.utils import column_index_from_string
+from pandas.api.types import union_categoricals
+
+# Folder snapshot disimpan di samping file sumber
+SNAPSHOT_DIR = ".snapshots"
+
+# Jumlah baris per chunk pada mode streaming
+CHUNK_SIZE = 50_000
+
+# Pada mode "auto", file di atas ukuran ini dibaca per chunk
+STREAMING_THRESHOLD_BYTES = 50 * 1024 * 1024
+
+# Kolom teks dengan rasio nilai unik di bawah batas ini disimpan sebagai category
+CATEGORY_RATIO = 0.5
+
+# Teks yang dianggap kosong oleh pd.read_excel (mis. Discount Band "None")
+NA_STRINGS = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+
+# Fungsi untuk membuat hash dari argumen read_excel (sheet, kolom, baris)
+def _kwargs_key(read_kwargs):
+    return hashlib.sha256(json.dumps(read_kwargs, sort_keys=True, default=str).encode()).hexdigest()[:8]
+
+
+# Fungsi untuk membuat hash dari isi file dan mtime-nya
+def _file_key(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    digest.update(str(os.stat(path).st_mtime_ns).encode())
+    return digest.hexdigest()[:16]
+
+
+# Fungsi untuk menentukan lokasi file snapshot (.parquet) dari file sumber
+def snapshot_path(path, read_kwargs):
+    folder = os.path.join(os.path.dirname(os.path.abspath(path)), SNAPSHOT_DIR)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(folder, f"{stem}-{_kwargs_key(read_kwargs)}-{_file_key(path)}.parquet")
+
+
+# Parquet butuh satu tipe per kolom: kolom object campuran (mis. Profit berisi
+# angka dan "-") disimpan sebagai string, nilai kosong tetap NaN
+def _normalize_for_parquet(df):
+    df = df.copy()
+    for column in df.columns[df.dtypes == object]:
+        values = df[column].dropna()
+        if values.map(type).nunique() > 1:
+            df[column] = df[column].map(lambda v: v if pd.isna(v) else str(v)).astype(object)
+    return df
+
+
+# Fungsi untuk menghapus snapshot lama dari file sumber dan argumen yang sama.
+# File sementara versi yang sama (milik proses lain) tidak dihapus
+def _remove_stale_snapshots(target):
+    folder = os.path.dirname(target)
+    current = os.path.basename(target)
+    prefix = current.rsplit("-", 1)[0] + "-"
+    for name in os.listdir(folder):
+        if name.startswith(prefix) and not name.startswith(current):
+            try:
+                os.remove(os.path.join(folder, name))
+            except FileNotFoundError:
+                # Sudah dihapus oleh proses lain
+                pass
+
+
+# Fungsi untuk membaca Excel lewat snapshot kolumnar: file .xlsx hanya di-parse
+# sekali, pembacaan berikutnya langsung dari Parquet selama file tidak berubah
+def read_excel_snapshot(path, **read_kwargs):
+    target = snapshot_path(path, read_kwargs)
+    if os.path.exists(target):
+        return pd.read_parquet(target)
+
+    df = pd.read_excel(path, **read_kwargs)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    # File sementara per proses, jadi beberapa proses yang mulai bersamaan tidak
+    # menulis file yang sama
+    tmp = f"{target}.{os.getpid()}.tmp"
+    _normalize_for_parquet(df).to_parquet(tmp, index=False)
+    os.replace(tmp, target)
+    _remove_stale_snapshots(target)
+    return pd.read_parquet(target)
+
+
+# Fungsi untuk membaca seluruh file sesuai format: Excel lewat snapshot Parquet,
+# .csv dan .parquet langsung. read_kwargs hanya dipakai untuk Excel
+def read_table(path, **read_kwargs):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return pd.read_csv(path)
+    if extension == ".parquet":
+        return pd.read_parquet(path)
+    return read_excel_snapshot(path, **read_kwargs)
+
+
+# Fungsi untuk menentukan apakah file dibaca per chunk. Diatur lewat env
+# DASHBOARD_INGEST: "stream", "full", atau "auto" (berdasarkan ukuran file)
+def use_streaming(path):
+    mode = os.environ.get("DASHBOARD_INGEST", "auto")
+    if mode == "auto":
+        return os.path.getsize(path) > STREAMING_THRESHOLD_BYTES
+    return mode == "stream"
+
+
+# Fungsi untuk membaca sheet Excel per chunk dengan openpyxl read-only, jadi
+# memori hanya sebesar satu chunk berapapun ukuran file-nya
+def iter_excel_chunks(path, sheet_name=0, skiprows=0, usecols=None, chunksize=CHUNK_SIZE):
+    min_col, max_col = None, None
+    if usecols is not None:
+        first, last = usecols.split(":")
+        min_col, max_col = column_index_from_string(first), column_index_from_string(last)
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if isinstance(sheet_name, str) else workbook.worksheets[sheet_name]
+        rows = sheet.iter_rows(min_row=skiprows + 1, min_col=min_col, max_col=max_col, values_only=True)
+        header = next(rows)
+        buffer = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            buffer.append(row)
+            if len(buffer) == chunksize:
+                yield _chunk_frame(buffer, header)
+                buffer = []
+        if buffer:
+            yield _chunk_frame(buffer, header)
+    finally:
+        workbook.close()
+
+
+# Fungsi untuk membuat DataFrame dari satu chunk baris, teks kosong jadi NaN
+def _chunk_frame(rows, header):
+    df = pd.DataFrame(rows, columns=header)
+    text_columns = df.columns[df.dtypes == object]
+    df[text_columns] = df[text_columns].replace(NA_STRINGS, np.nan)
+    return df
+
+
+# Fungsi untuk membaca file per chunk sesuai format: .xlsx, .csv, atau .parquet.
+# read_kwargs (sheet_name, skiprows, usecols) hanya dipakai untuk Excel
+def iter_chunks(path, chunksize=CHUNK_SIZE, **read_kwargs):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        yield from pd.read_csv(path, chunksize=chunksize)
+    elif extension == ".parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from iter_excel_chunks(path, chunksize=chunksize, **read_kwargs)
+
+
+# Fungsi untuk mengagregasi chunk satu per satu: setiap chunk di-groupby lalu
+# digabung ke hasil sebelumnya, jadi memori hanya sebesar jumlah grup.
+# Kolom "Transactions" berisi jumlah baris asli di setiap grup
+def stream_aggregate(chunks, by, sums, prepare=None):
+    partial = None
+    for chunk in chunks:
+        if prepare is not None:
+            chunk = prepare(chunk)
+        chunk = chunk.assign(Transactions=1)
+        grouped = chunk.groupby(by=by, dropna=False)[sums + ["Transactions"]].sum()
+        if partial is not None:
+            grouped = pd.concat([partial, grouped]).groupby(level=list(range(len(by))), dropna=False).sum()
+        partial = grouped
+    return partial.reset_index()
+
+
+# Fungsi untuk menggabungkan DataFrame dengan kolom yang sama. Kategori setiap
+# kolom category disatukan lebih dulu (terurut, seperti astype("category")),
+# jadi hasilnya tetap category dan dtype-nya tidak bergantung pada bagian yang
+# kosong atau berisi NA saja
+def concat_frames(parts, **kwargs):
+    parts = list(parts)
+    for column in parts[0].columns:
+        if all(isinstance(part[column].dtype, pd.CategoricalDtype) for part in parts):
+            categories = union_categoricals([part[column] for part in parts], sort_categories=True).categories
+            parts = [part.assign(**{column: part[column].cat.set_categories(categories)}) for part in parts]
+    return pd.concat(parts, **kwargs)
+
+
+# Fungsi untuk menyebut nama kolom hasil kali (x * y) dari setiap pasangan kolom
+def moment_columns(columns):
+    return [f"{a} * {b}" for i, a in enumerate(columns) for b in columns[i:]]
+
+
+# Fungsi untuk menambahkan kolom hasil kali, agar korelasi tetap bisa dihitung
+# setelah data diagregasi
+def add_moment_columns(df, columns):
+    for i, a in enumerate(columns):
+        for b in columns[i:]:
+            df[f"{a} * {b}"] = df[a] * df[b]
+    return df
+
+
+# Fungsi untuk menghitung matriks korelasi dari jumlah dan jumlah hasil kali
+def correlation_from_moments(df, columns, count_column="Transactions"):
+    n = df[count_column].sum()
+    means = df[columns].sum() / n
+    covariance = pd.DataFrame(index=columns, columns=columns, dtype=float)
+    for i, a in enumerate(columns):
+        for b in columns[i:]:
+            value = df[f"{a} * {b}"].sum() / n - means[a] * means[b]
+            covariance.loc[a, b] = covariance.loc[b, a] = value
+    std = np.sqrt(np.diag(covariance.values))
+    return covariance / np.outer(std, std)
+
+
+# Fungsi untuk mengubah kolom angka format akuntansi menjadi float64 dalam satu
+# tahap: "(1,234.50)" -> -1234.5, "$ 1,000" -> 1000, "-" -> NaN. Nilai yang
+# sudah berupa angka langsung dikonversi; regex hanya dijalankan pada sisa teks
+def parse_accounting_numbers(values):
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype("float64")
+    numbers = pd.to_numeric(values, errors="coerce").astype("float64")
+    pending = numbers.isna() & values.notna()
+    if pending.any():
+        text = values[pending].astype(str).str.strip()
+        digits = text.str.replace(r"[^\d.]", "", regex=True)
+        parsed = pd.to_numeric(digits.where(digits != ""), errors="coerce")
+        negative = text.str.contains(r"\(.*\)") | text.str.startswith("-")
+        numbers[pending] = parsed.where(~negative, -parsed).values
+    return numbers
+
+
+# Fungsi untuk memperkecil DataFrame di memori. schema memetakan kolom ke dtype
+# (mis. {"City": "category", "hour": "int8"}); kolom lain diatur otomatis:
+# integer di-downcast dan teks dengan sedikit nilai unik menjadi category.
+# Kolom float tetap float64 karena dijumlahkan untuk KPI
+def compact_frame(df, schema=None):
+    schema = schema or {}
+    for column in df.columns:
+        values = df[column]
+        if column in schema:
+            df[column] = values.astype(schema[column])
+        elif pd.api.types.is_integer_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            df[column] = pd.to_numeric(values, downcast="integer")
+        elif values.dtype == object or pd.api.types.is_string_dtype(values):
+            if values.nunique(dropna=False) <= CATEGORY_RATIO * len(values):
+                df[column] = values.astype("category")
+    return df
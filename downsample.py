@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+# Jumlah titik maksimal per garis yang dikirim ke browser (kurang lebih satu
+# titik per piksel lebar chart)
+MAX_POINTS = 1000
+
+# Di atas jumlah titik ini (semua garis dalam satu chart) chart dirender dengan WebGL
+WEBGL_THRESHOLD = 2000
+
+
+# Fungsi untuk mengubah sumbu x (angka atau tanggal) menjadi float
+def _as_float(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return values.astype(float)
+
+
+# Fungsi untuk memilih titik dengan Largest-Triangle-Three-Buckets (LTTB):
+# titik pertama dan terakhir tetap, lalu dari setiap bucket dipilih titik yang
+# membentuk segitiga terbesar dengan titik terpilih sebelumnya dan rata-rata
+# bucket berikutnya. Bentuk garis (puncak dan lembah) tetap terlihat
+def lttb_indices(x, y, n_out):
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = _as_float(x)
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    every = (n - 2) / (n_out - 2)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+# Fungsi untuk memilih titik min dan max dari setiap bucket (n_out / 2 bucket).
+# Lebih cepat dari LTTB dan tidak pernah menghilangkan lonjakan
+def minmax_indices(y, n_out):
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    indices = [0, n - 1]
+    for bucket in np.array_split(np.arange(n), n_out // 2 - 1):
+        indices += [bucket[np.argmin(y[bucket])], bucket[np.argmax(y[bucket])]]
+    return np.unique(indices)
+
+
+# Fungsi untuk memperkecil satu deret waktu (index sebagai sumbu x)
+def downsample_series(series, max_points=MAX_POINTS, method="lttb"):
+    if len(series) <= max_points:
+        return series
+    if method == "minmax":
+        return series.iloc[minmax_indices(series.values, max_points)]
+    return series.iloc[lttb_indices(series.index.values, series.values, max_points)]
+
+
+# Fungsi untuk memperkecil data chart garis sebelum dibuat figure: setiap garis
+# (kelompok `by`, mis. Country) dipangkas ke max_points titik. Data harus sudah
+# terurut menurut x
+def downsample_frame(df, x, y, by=None, max_points=MAX_POINTS, method="lttb"):
+    groups = [df] if by is None else [group for _, group in df.groupby(by, observed=True, sort=False)]
+    if all(len(group) <= max_points for group in groups):
+        return df
+    parts = []
+    for group in groups:
+        if method == "minmax":
+            parts.append(group.iloc[minmax_indices(group[y].values, max_points)])
+        else:
+            parts.append(group.iloc[lttb_indices(group[x].values, group[y].values, max_points)])
+    return pd.concat(parts)
+
+
+# Fungsi untuk memilih render_mode px.line: WebGL (Scattergl) untuk chart
+# dengan banyak titik, SVG untuk chart kecil
+def render_mode(n_points):
+    return "webgl" if n_points > WEBGL_THRESHOLD else "svg"
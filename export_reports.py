@@ -0,0 +1,167 @@
+import argparse
+import importlib.util
+import json
+import os
+import time
+from concurrent.futures import as_completed
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from aggregates import summarize_chunks
+from charts import FINANCIAL_CHARTS, SALES_CHARTS
+from data_loader import CHUNK_SIZE
+from forecasting import forecast_segments, future_predictions, limited_process_pool
+from pipelines import (
+    build_financial_cube,
+    build_sales_cube,
+    financial_kpis,
+    financial_monthly,
+    load_financial_data,
+    load_sales_data,
+    sales_kpis,
+)
+
+# Dataset yang diekspor: (fungsi load, fungsi cube, fungsi KPI, chart)
+DATASETS = {
+    "sales": (load_sales_data, build_sales_cube, sales_kpis, SALES_CHARTS),
+    "financial": (load_financial_data, build_financial_cube, financial_kpis, FINANCIAL_CHARTS),
+}
+
+# Ringkasan data per dataset: kolom per jenis state. State dihitung dari data
+# yang sudah dibaca, per potongan secara paralel, lalu digabung
+SUMMARIES = {
+    "sales": {"sums": ["Total", "Rating"], "extremes": ["Total", "Rating"], "quantiles": ["Total"],
+              "distinct": ["Invoice ID"]},
+    "financial": {"sums": ["Sales", "Profit"], "extremes": ["Sales", "Profit"], "quantiles": ["Sales", "Profit"],
+                  "distinct": ["Product", "Country"]},
+}
+
+
+# Fungsi untuk meringkas data yang sudah dibaca. Data agregat (mode streaming,
+# Transactions > 1) hanya punya jumlah per sel, jadi min/max dan kuantil per
+# transaksi dilewati; kolom yang tidak ada di data juga dilewati
+def _summarize(data, spec, max_workers=None):
+    aggregated = bool((data["Transactions"] > 1).any())
+    spec = {kind: [column for column in columns if column in data.columns]
+            for kind, columns in spec.items() if not (aggregated and kind in ("extremes", "quantiles"))}
+    chunks = (data.iloc[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE))
+    return summarize_chunks(chunks, max_workers=max_workers, count_column="Transactions", **spec)
+
+
+# Fungsi untuk membuat tabel siap ditulis ke Parquet/Excel: index (mis. pivot
+# dan matriks korelasi) menjadi kolom dan nama kolom menjadi teks
+def _flat_table(table):
+    if not isinstance(table.index, pd.RangeIndex):
+        table = table.reset_index()
+    table = table.copy()
+    table.columns = [str(column) for column in table.columns]
+    return table
+
+
+# Fungsi worker: hitung tabel satu chart lalu tulis tabel (Parquet), figure
+# JSON, HTML interaktif, dan PNG (jika kaleido terpasang)
+def _export_chart(dataset, chart_id, chart, cells, output_dir):
+    start = time.perf_counter()
+    table = chart.aggregate(cells)
+    figure = chart.figure(table)
+    table = _flat_table(table)
+
+    os.makedirs(os.path.join(output_dir, dataset, "tables"), exist_ok=True)
+    os.makedirs(os.path.join(output_dir, dataset, "figures"), exist_ok=True)
+    table.to_parquet(os.path.join(output_dir, dataset, "tables", f"{chart_id}.parquet"), index=False)
+    base = os.path.join(output_dir, dataset, "figures", chart_id)
+    with open(base + ".json", "w") as f:
+        f.write(figure.to_json())
+    figure.write_html(base + ".html", include_plotlyjs="cdn")
+    if importlib.util.find_spec("kaleido") is not None:
+        figure.write_image(base + ".png")
+    return dataset, chart_id, table, time.perf_counter() - start
+
+
+# Fungsi untuk menulis KPI ke JSON
+def _write_json(data, path):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, default=str)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export all dashboard KPIs, tables, figures and forecasts.")
+    parser.add_argument("--output-dir", default="reports")
+    parser.add_argument("--datasets", nargs="+", choices=list(DATASETS), default=list(DATASETS))
+    parser.add_argument("--steps", type=int, default=12, help="forecast horizon in months")
+    parser.add_argument("--no-forecast", action="store_true", help="skip the SARIMAX forecasts")
+    parser.add_argument("--segments", action="store_true", help="also forecast every Product x Country and Segment")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    manifest = {"created": datetime.now(timezone.utc).isoformat(), "datasets": {}, "timings": {}}
+
+    # Data dibaca sekali per dataset; semua tabel dan chart dihitung dari sel cube
+    cubes = {}
+    for dataset in args.datasets:
+        load, build_cube, kpis, _ = DATASETS[dataset]
+        start = time.perf_counter()
+        data = load()
+        cubes[dataset] = build_cube(data)
+        manifest["timings"][f"{dataset}/load"] = time.perf_counter() - start
+        os.makedirs(os.path.join(args.output_dir, dataset), exist_ok=True)
+        _write_json(kpis(cubes[dataset].cells), os.path.join(args.output_dir, dataset, "kpis.json"))
+        cubes[dataset].cells.to_parquet(os.path.join(args.output_dir, dataset, "cells.parquet"), index=False)
+
+        # Jumlah, rata-rata, min/max, kuantil dan jumlah nilai unik per kolom dari data yang sama
+        start = time.perf_counter()
+        summary = _summarize(data, SUMMARIES[dataset], max_workers=args.workers)
+        _write_json(summary.summary(), os.path.join(args.output_dir, dataset, "summary.json"))
+        manifest["timings"][f"{dataset}/summary"] = time.perf_counter() - start
+
+    # Semua chart dan forecast diekspor paralel di satu pool, jadi --workers
+    # membatasi jumlah proses untuk keduanya
+    tables = {dataset: {} for dataset in args.datasets}
+    with limited_process_pool(args.workers) as executor:
+        futures = [
+            executor.submit(_export_chart, dataset, chart_id, chart, cubes[dataset].cells, args.output_dir)
+            for dataset in args.datasets
+            for chart_id, chart in DATASETS[dataset][3].items()
+        ]
+
+        if "financial" in args.datasets and not args.no_forecast:
+            forecast_dir = os.path.join(args.output_dir, "forecast")
+            os.makedirs(forecast_dir, exist_ok=True)
+            start = time.perf_counter()
+            future_df = future_predictions(financial_monthly(cubes["financial"].cells), steps=args.steps,
+                                           executor=executor)
+            manifest["timings"]["forecast/future"] = time.perf_counter() - start
+            # Sama dengan export prediction_results.xlsx di Prediction_Financial.py
+            future_df.to_excel(os.path.join(forecast_dir, "prediction_results.xlsx"), index=False)
+            future_df.to_parquet(os.path.join(forecast_dir, "prediction_results.parquet"), index=False)
+            future_df.to_json(os.path.join(forecast_dir, "prediction_results.json"), orient="records", date_format="iso")
+
+            if args.segments:
+                start = time.perf_counter()
+                segment_forecasts, segment_timings = forecast_segments(
+                    cubes["financial"].cells.set_index("Date"), steps=args.steps, executor=executor)
+                manifest["timings"]["forecast/segments"] = time.perf_counter() - start
+                segment_forecasts.to_parquet(os.path.join(forecast_dir, "segment_forecasts.parquet"), index=False)
+                segment_timings.to_parquet(os.path.join(forecast_dir, "segment_timings.parquet"), index=False)
+
+        for future in as_completed(futures):
+            dataset, chart_id, table, seconds = future.result()
+            tables[dataset][chart_id] = table
+            manifest["timings"][f"{dataset}/{chart_id}"] = seconds
+
+    # Semua tabel satu dataset juga ditulis ke satu workbook, satu sheet per chart
+    for dataset in args.datasets:
+        with pd.ExcelWriter(os.path.join(args.output_dir, dataset, "tables.xlsx")) as writer:
+            for chart_id in DATASETS[dataset][3]:
+                tables[dataset][chart_id].to_excel(writer, sheet_name=chart_id[:31], index=False)
+        manifest["datasets"][dataset] = {"cells": len(cubes[dataset].cells), "charts": list(DATASETS[dataset][3])}
+
+    manifest["timings"]["total"] = time.perf_counter() - started
+    _write_json(manifest, os.path.join(args.output_dir, "manifest.json"))
+    print(f"Reports written to {args.output_dir} in {manifest['timings']['total']:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+
+# Tema terang untuk chart utama: plotly_white dengan judul besar di tengah,
+# pengganti dict update_layout yang sama di setiap chart
+LIGHT_THEME = go.layout.Template(pio.templates["plotly_white"])
+LIGHT_THEME.layout.update(
+    title=dict(y=0.9, x=0.5, xanchor="center", yanchor="top",
+               font=dict(size=24, family="Arial, sans-serif")),
+    plot_bgcolor="rgba(0,0,0,0)",
+    xaxis=dict(showgrid=False),
+)
+
+# Tema gelap dashboard (teks putih di atas #00172B) dalam satu template plotly,
+# pengganti pemanggilan set_color/set_facecolor per sumbu di matplotlib
+DARK_THEME = go.layout.Template(
+    layout=go.Layout(
+        paper_bgcolor="#00172B",
+        plot_bgcolor="#00172B",
+        font=dict(color="white"),
+        title=dict(font=dict(size=18, color="white"), x=0.5, xanchor="center"),
+        xaxis=dict(showline=True, linecolor="white", mirror=True, gridcolor="gray", griddash="dash",
+                   title=dict(font=dict(size=14))),
+        yaxis=dict(showline=True, linecolor="white", mirror=True, gridcolor="gray", griddash="dash",
+                   title=dict(font=dict(size=14))),
+        coloraxis=dict(colorbar=dict(tickfont=dict(color="white"), title=dict(font=dict(color="white")))),
+        legend=dict(font=dict(color="white")),
+    )
+)
+
+# Jumlah figure maksimal di cache per halaman sebelum yang paling lama tidak dipakai dibuang
+MAX_CACHED_FIGURES = 128
+
+
+# Fungsi untuk membuat hash dari state filter sidebar, contoh:
+# filter_state_key({"Country": [...], "Segment": [...]})
+def filter_state_key(selections):
+    state = {column: sorted(map(str, values)) for column, values in sorted(selections.items())}
+    return hashlib.sha256(json.dumps(state).encode()).hexdigest()[:16]
+
+
+# Registry chart untuk satu halaman. Setiap chart mendaftarkan fungsi build(cells)
+# dan dimensi filter yang dipakainya. Figure JSON di-cache (LRU) dengan key
+# (id chart, isi cube, pilihan filter yang dipakai chart), jadi rerun hanya
+# membangun ulang chart yang inputnya benar-benar berubah
+class ChartRegistry:
+    def __init__(self, max_entries=MAX_CACHED_FIGURES):
+        self.max_entries = max_entries
+        self.charts = {}
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # Fungsi untuk mendaftarkan chart. Dipanggil setiap rerun; fungsi build
+    # diganti tetapi figure yang sudah di-cache tetap dipakai
+    def register(self, chart_id, depends_on, build):
+        self.charts[chart_id] = (list(depends_on), build)
+
+    # Fungsi untuk mengambil figure (dict plotly) dari cache atau membangunnya
+    # dari sel cube yang difilter hanya dengan dimensi yang dipakai chart.
+    # Parameter tambahan (mis. x_range untuk zoom) diteruskan ke build dan ikut
+    # menjadi bagian key cache
+    def figure(self, chart_id, cube, selections, **params):
+        depends_on, build = self.charts[chart_id]
+        used = {column: selections[column] for column in depends_on}
+        key = (chart_id, cube.fingerprint, filter_state_key(used), repr(sorted(params.items())))
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return json.loads(self.cache[key])
+            self.misses += 1
+
+        figure_json = build(cube.select(used), **params).to_json()
+        with self.lock:
+            self.cache[key] = figure_json
+            while len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)
+        return json.loads(figure_json)
+
+
+# Fungsi untuk mengambil registry chart per halaman, dipakai bersama semua sesi
+@st.cache_resource
+def chart_registry(page):
+    return ChartRegistry()
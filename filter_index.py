@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+
+# Index filter untuk sidebar: setiap kolom filter diubah menjadi kode kategori
+# dan setiap nilai punya satu bitmap (np.packbits, 1 bit per baris). Kombinasi
+# pilihan filter cukup dihitung dengan OR per kolom lalu AND antar kolom.
+class FilterIndex:
+    def __init__(self, df, columns):
+        self.n_rows = len(df)
+        self.bitmaps = {}
+        self.options = {}
+        self.has_missing = {}
+        for column in columns:
+            # pd.factorize menjaga urutan kemunculan, sama seperti df[column].unique()
+            codes, uniques = pd.factorize(df[column])
+            self.options[column] = uniques
+            self.has_missing[column] = bool((codes == -1).any())
+            self.bitmaps[column] = {
+                value: np.packbits(codes == code) for code, value in enumerate(uniques)
+            }
+
+    # Fungsi untuk mengambil daftar pilihan filter (pengganti df[column].unique())
+    def values(self, column):
+        return self.options[column]
+
+    # Fungsi untuk menghitung mask boolean dari pilihan filter,
+    # contoh: index.mask({"City": ["Jakarta"], "Gender": ["Male", "Female"]})
+    def mask(self, selections):
+        result = None
+        for column, selected in selections.items():
+            bitmaps = self.bitmaps[column]
+            # Semua nilai dipilih ("Select All"): kolom ini tidak perlu dihitung
+            if not self.has_missing[column] and len(bitmaps) == len(set(selected) & bitmaps.keys()):
+                continue
+            chosen = [bitmaps[value] for value in selected if value in bitmaps]
+            if chosen:
+                column_bits = np.bitwise_or.reduce(chosen)
+            else:
+                column_bits = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+            result = column_bits if result is None else result & column_bits
+        if result is None:
+            return np.ones(self.n_rows, dtype=bool)
+        return np.unpackbits(result, count=self.n_rows).view(bool)
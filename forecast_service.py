@@ -0,0 +1,230 @@
+import argparse
+import json
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from forecasting import build_and_train_model
+from pipelines import (
+    FINANCIAL_FILE,
+    FINANCIAL_FILTERS,
+    build_financial_cube,
+    financial_monthly,
+    load_financial_data,
+)
+
+# Horizon (bulan) yang dihitung saat start, sekali fit per deret
+COMMON_HORIZONS = (1, 3, 6, 12, 24)
+
+# Batas horizon yang dilayani
+MAX_STEPS = 120
+
+# Jumlah jawaban yang disimpan di cache LRU
+MAX_CACHED_FORECASTS = 1024
+
+# Metrik yang bisa diprediksi: jumlah bulanan Sales dan Profit, dan rata-rata
+# bulanan per transaksi untuk harga satuan (jumlah harga satuan tidak bermakna)
+SUM_METRICS = ["Sales", "Profit"]
+MEAN_METRICS = ["Manufacturing Price", "Sale Price"]
+METRICS = SUM_METRICS + MEAN_METRICS
+
+
+# Kesalahan permintaan (metrik, segmen, atau horizon tidak valid)
+class ForecastError(ValueError):
+    pass
+
+
+# Layanan forecast: deret bulanan per metrik dan segmen diambil dari cube
+# finansial, model SARIMAX diambil dari model_store (.models, di-fit hanya jika
+# belum ada), dan setiap jawaban disimpan sebagai JSON siap kirim di cache LRU.
+# Model di-fit pada seluruh deret (train_size=1.0) seperti forecasting.forecast_segments
+class ForecastService:
+    def __init__(self, cube, order=(1, 1, 1), seasonal_order=(1, 1, 1, 12), max_cached=MAX_CACHED_FORECASTS):
+        self.cube = cube
+        self.order = order
+        self.seasonal_order = seasonal_order
+        self.max_cached = max_cached
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # Fungsi untuk memeriksa dan merapikan segmen, mis. {"Country": "Canada"}
+    def _segment(self, segment):
+        segment = segment or {}
+        for column, value in segment.items():
+            if column not in FINANCIAL_FILTERS:
+                raise ForecastError(f"unknown segment column {column!r}, expected one of {FINANCIAL_FILTERS}")
+            if value not in set(self.cube.values(column)):
+                raise ForecastError(f"unknown {column} {value!r}")
+        return tuple(sorted(segment.items()))
+
+    # Fungsi untuk mengambil deret bulanan satu metrik dan segmen. Harga satuan
+    # dirata-rata per transaksi; bulan tanpa transaksi menjadi NaN (data hilang bagi SARIMAX)
+    def series(self, metric, segment=()):
+        cells = self.cube.select({column: [value] for column, value in segment})
+        if cells.empty:
+            raise ForecastError(f"no data for segment {dict(segment)}")
+        if metric in MEAN_METRICS:
+            monthly = financial_monthly(cells, [metric, "Transactions"])
+            series = monthly[metric] / monthly["Transactions"]
+        else:
+            series = financial_monthly(cells, [metric])[metric]
+        series.name = metric
+        return series
+
+    # Fungsi untuk menghitung prediksi max(steps) bulan sekali, lalu menyimpan
+    # jawaban untuk setiap horizon (prediksi h bulan = h bulan pertama prediksi terpanjang).
+    # Mengembalikan jawaban per horizon, karena entri cache bisa sudah tergusur
+    # oleh thread lain sebelum dibaca
+    # Deret layanan (segmen, metrik lain) bernama sama dengan deret dashboard,
+    # jadi fit-nya tidak memakai lineage incremental model_store
+    def _compute(self, metric, segment, horizons, alpha):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            results, _ = build_and_train_model(self.series(metric, segment), self.order, self.seasonal_order,
+                                               train_size=1.0, incremental=False)
+            forecast = results.get_forecast(steps=max(horizons))
+        conf_int = forecast.conf_int(alpha=alpha)
+        rows = [
+            {"date": date.date().isoformat(), "predicted": float(predicted), "lower": float(lower), "upper": float(upper)}
+            for date, predicted, lower, upper in zip(forecast.predicted_mean.index, forecast.predicted_mean.values,
+                                                     conf_int.iloc[:, 0].values, conf_int.iloc[:, 1].values)
+        ]
+        bodies = {}
+        for steps in horizons:
+            answer = {"metric": metric, "segment": dict(segment), "steps": steps, "alpha": alpha,
+                      "forecast": rows[:steps]}
+            bodies[steps] = json.dumps(answer).encode()
+            self._store((metric, segment, steps, alpha), bodies[steps])
+        return bodies
+
+    # Fungsi untuk menyimpan satu jawaban ke cache LRU
+    def _store(self, key, body):
+        with self.lock:
+            self.cache[key] = body
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.max_cached:
+                self.cache.popitem(last=False)
+
+    # Fungsi untuk mengambil jawaban (JSON bytes) dari cache, atau menghitungnya
+    def forecast_json(self, metric="Sales", steps=12, segment=None, alpha=0.05):
+        if metric not in METRICS:
+            raise ForecastError(f"unknown metric {metric!r}, expected one of {METRICS}")
+        if not 1 <= steps <= MAX_STEPS:
+            raise ForecastError(f"steps must be between 1 and {MAX_STEPS}")
+        if not 0 < alpha < 1:
+            raise ForecastError("alpha must be between 0 and 1")
+        segment = self._segment(segment)
+        key = (metric, segment, steps, alpha)
+        with self.lock:
+            body = self.cache.get(key)
+            if body is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return body
+            self.misses += 1
+        horizons = sorted({steps, *[h for h in COMMON_HORIZONS if h <= steps]})
+        return self._compute(metric, segment, horizons, alpha)[steps]
+
+    # Fungsi untuk mengambil prediksi steps bulan dengan interval kepercayaan 1 - alpha
+    def get_forecast(self, metric="Sales", steps=12, segment=None, alpha=0.05):
+        return json.loads(self.forecast_json(metric, steps, segment, alpha))
+
+    # Fungsi untuk menghitung horizon umum lebih dulu: total untuk setiap metrik,
+    # dan (opsional) setiap nilai filter dan setiap Product x Country
+    def precompute(self, metrics=("Sales", "Profit"), segments=False, alpha=0.05):
+        targets = [()]
+        if segments:
+            targets += [((column, value),) for column in FINANCIAL_FILTERS for value in self.cube.values(column)]
+            targets += [tuple(sorted({"Product": product, "Country": country}.items()))
+                        for product in self.cube.values("Product") for country in self.cube.values("Country")]
+        failed = 0
+        for segment in targets:
+            for metric in metrics:
+                try:
+                    self._compute(metric, segment, list(COMMON_HORIZONS), alpha)
+                except Exception:
+                    failed += 1
+        return len(targets) * len(metrics) - failed, failed
+
+    # Fungsi untuk statistik cache (endpoint /stats)
+    def stats(self):
+        with self.lock:
+            return {"cached": len(self.cache), "max_cached": self.max_cached, "hits": self.hits, "misses": self.misses}
+
+
+# Handler HTTP: GET /forecast?metric=Sales&steps=12&alpha=0.05&Country=Canada,
+# GET /segments (metrik dan nilai segmen yang tersedia), GET /stats
+class _ForecastHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        if url.path == "/forecast":
+            try:
+                segment = {column: query[column] for column in FINANCIAL_FILTERS if column in query}
+                body = self.service.forecast_json(
+                    metric=query.get("metric", "Sales"),
+                    steps=int(query.get("steps", 12)),
+                    segment=segment,
+                    alpha=float(query.get("alpha", 0.05)),
+                )
+            except (ForecastError, ValueError) as error:
+                self._send(400, json.dumps({"error": str(error)}).encode())
+                return
+            except Exception as error:
+                self._send(500, json.dumps({"error": f"{type(error).__name__}: {error}"}).encode())
+                return
+            self._send(200, body)
+        elif url.path == "/segments":
+            cube = self.service.cube
+            segments = {column: [str(value) for value in cube.values(column)] for column in FINANCIAL_FILTERS}
+            self._send(200, json.dumps({"metrics": METRICS, "segments": segments}).encode())
+        elif url.path == "/stats":
+            self._send(200, json.dumps(self.service.stats()).encode())
+        else:
+            self._send(404, json.dumps({"error": "not found"}).encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Fungsi untuk membuat server HTTP untuk sebuah ForecastService
+def make_server(service, host="127.0.0.1", port=8600):
+    handler = type("ForecastHandler", (_ForecastHandler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve SARIMAX forecasts as JSON over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--data", default=FINANCIAL_FILE)
+    parser.add_argument("--segments", action="store_true",
+                        help="also precompute every filter value and every Product x Country")
+    parser.add_argument("--cache-size", type=int, default=MAX_CACHED_FORECASTS)
+    args = parser.parse_args()
+
+    service = ForecastService(build_financial_cube(load_financial_data(args.data)), max_cached=args.cache_size)
+    start = time.perf_counter()
+    done, failed = service.precompute(segments=args.segments)
+    print(f"Precomputed {done} series ({failed} failed) in {time.perf_counter() - start:.1f} s")
+    server = make_server(service, args.host, args.port)
+    print(f"Serving forecasts on http://{args.host}:{args.port}/forecast")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
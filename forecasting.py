@@ -0,0 +1,184 @@
+import os
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from multiprocessing import get_context
+
+import pandas as pd
+
+from model_store import load_or_fit
+
+# Variabel lingkungan untuk membatasi thread BLAS di setiap worker, agar
+# banyak proses fit tidak saling berebut core
+BLAS_THREAD_VARIABLES = [
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+]
+
+
+# Jumlah process pool yang sedang terbuka di proses ini dan nilai env sebelum
+# pool pertama dibuka. Pool bisa dibuka bersamaan dari beberapa thread (mis.
+# pencarian order sales dan profit di thread latar Prediction_Financial.py)
+_pool_lock = threading.Lock()
+_open_pools = 0
+_saved_environ = {}
+
+
+# Process pool untuk fit paralel. Worker dibuat dengan "spawn" dan mewarisi
+# batas thread BLAS dari env saat start. BLAS membaca batas ini saat numpy
+# diimpor, sebelum initializer pool berjalan, jadi batas harus sudah ada di env
+# induk. Env dipasang saat pool pertama dibuka dan dikembalikan setelah pool
+# terakhir ditutup, jadi worker dari pool mana pun selalu mendapat batasnya
+@contextmanager
+def limited_process_pool(max_workers=None):
+    global _open_pools, _saved_environ
+    with _pool_lock:
+        if _open_pools == 0:
+            _saved_environ = {name: os.environ.get(name) for name in BLAS_THREAD_VARIABLES}
+            os.environ.update({name: "1" for name in BLAS_THREAD_VARIABLES})
+        _open_pools += 1
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=get_context("spawn")) as executor:
+            yield executor
+    finally:
+        with _pool_lock:
+            _open_pools -= 1
+            if _open_pools == 0:
+                for name, value in _saved_environ.items():
+                    if value is None:
+                        os.environ.pop(name, None)
+                    else:
+                        os.environ[name] = value
+
+
+# Fungsi untuk memakai process pool yang sudah ada (mis. pool chart di
+# export_reports.py, agar jumlah worker tetap dibatasi satu pool) atau membuat pool baru
+@contextmanager
+def _process_pool(executor, max_workers):
+    if executor is not None:
+        yield executor
+    else:
+        with limited_process_pool(max_workers) as executor:
+            yield executor
+
+
+# Fungsi untuk membangun dan melatih model ARIMA. incremental=False untuk deret
+# selain deret total dashboard (mis. per segmen): lineage model_store hanya
+# dikenali dari nama deret dan order, jadi deret lain bernama "Sales" akan
+# menimpa lineage dashboard
+def build_and_train_model(data, order=(1, 1, 1), seasonal_order=(1, 1, 1, 12), train_size=0.8, incremental=True):
+    train = data[:int(train_size * len(data))]
+    test = data[int(train_size * len(data)):]
+    results = load_or_fit(train, order, seasonal_order, incremental=incremental)
+    return results, test
+
+
+# Fungsi untuk membuat deret bulanan dari data dengan index Date
+def monthly_series(df, column):
+    return df[column].resample('M').sum()
+
+
+# Fungsi worker: prediksi masa depan satu metrik dengan model yang sama seperti
+# di Prediction_Financial.py (train 80% data)
+def _future_one(metric, series, steps, order, seasonal_order):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        results, _ = build_and_train_model(series, order, seasonal_order)
+        forecast = results.get_forecast(steps=steps)
+    conf_int = forecast.conf_int()
+    return metric, forecast.predicted_mean.values, conf_int.iloc[:, 0].values, conf_int.iloc[:, 1].values
+
+
+# Fungsi untuk memprediksi semua kolom deret bulanan (mis. Sales dan Profit)
+# secara paralel (di executor jika diberikan). Hasilnya tabel future_df seperti di Prediction_Financial.py,
+# ditambah batas bawah/atas interval prediksi
+def future_predictions(monthly, steps=12, order=(1, 1, 1), seasonal_order=(1, 1, 1, 12), max_workers=None,
+                       executor=None):
+    future_dates = pd.date_range(start=monthly.index[-1], periods=steps, freq='M') + pd.Timedelta(days=1)
+    with _process_pool(executor, max_workers) as executor:
+        futures = [
+            executor.submit(_future_one, metric, monthly[metric], steps, order, seasonal_order)
+            for metric in monthly.columns
+        ]
+        results = {metric: (predicted, lower, upper)
+                   for metric, predicted, lower, upper in (future.result() for future in futures)}
+    future_df = pd.DataFrame({
+        'Date': future_dates,
+        **{f'Predicted {metric}': results[metric][0] for metric in monthly.columns},
+        **{f'Lower {metric}': results[metric][1] for metric in monthly.columns},
+        **{f'Upper {metric}': results[metric][2] for metric in monthly.columns},
+    })
+    return future_df
+
+
+# Fungsi worker: fit satu deret dan kembalikan prediksi, waktu, dan status.
+# Error ditangkap per fit supaya satu deret yang gagal tidak menghentikan batch
+def _forecast_one(segment, metric, series, steps, order, seasonal_order):
+    start = time.perf_counter()
+    row = {**segment, "Metric": metric, "Observations": len(series)}
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            results, _ = build_and_train_model(series, order, seasonal_order, train_size=1.0, incremental=False)
+            forecast = results.get_forecast(steps=steps)
+        conf_int = forecast.conf_int()
+        frame = pd.DataFrame({
+            **segment,
+            "Metric": metric,
+            "Date": forecast.predicted_mean.index,
+            "Predicted": forecast.predicted_mean.values,
+            "Lower": conf_int.iloc[:, 0].values,
+            "Upper": conf_int.iloc[:, 1].values,
+        })
+        row.update(Status="ok", Converged=bool(results.mle_retvals.get("converged", True)), Error=None)
+    except Exception as error:
+        frame = None
+        row.update(Status="failed", Converged=False, Error=f"{type(error).__name__}: {error}")
+    row["Seconds"] = time.perf_counter() - start
+    return frame, row
+
+
+# Fungsi untuk membuat semua tugas fit: satu deret per segmen per metrik
+def _segment_tasks(df, groupings, metrics):
+    for by in groupings:
+        for values, group in df.groupby(by=by, observed=True):
+            values = values if isinstance(values, tuple) else (values,)
+            segment = dict(zip(by, values))
+            for metric in metrics:
+                yield segment, metric, monthly_series(group, metric)
+
+
+# Fungsi untuk forecast semua segmen (default: Product x Country dan Segment)
+# secara paralel dengan process pool (executor jika diberikan). df harus sudah bersih dengan index Date.
+# Mengembalikan (forecasts, timings): prediksi rapi per segmen/metrik/bulan dan
+# tabel waktu serta status setiap fit
+def forecast_segments(df, groupings=(("Product", "Country"), ("Segment",)), metrics=("Sales", "Profit"),
+                      steps=12, order=(1, 1, 1), seasonal_order=(1, 1, 1, 12), max_workers=None, executor=None):
+    groupings = [list(by) for by in groupings]
+    frames, rows = [], []
+
+    with _process_pool(executor, max_workers) as executor:
+        futures = [
+            executor.submit(_forecast_one, segment, metric, series, steps, order, seasonal_order)
+            for segment, metric, series in _segment_tasks(df, groupings, metrics)
+        ]
+        for future in as_completed(futures):
+            frame, row = future.result()
+            rows.append(row)
+            if frame is not None:
+                frames.append(frame)
+
+    segment_columns = list(dict.fromkeys(column for by in groupings for column in by))
+    forecasts = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    timings = pd.DataFrame(rows)
+    if not forecasts.empty:
+        forecasts = forecasts.reindex(columns=segment_columns + ["Metric", "Date", "Predicted", "Lower", "Upper"])
+        forecasts = forecasts.sort_values(segment_columns + ["Metric", "Date"], na_position="first", ignore_index=True)
+    timings = timings.reindex(columns=segment_columns + ["Metric", "Observations", "Status", "Converged", "Seconds", "Error"])
+    timings = timings.sort_values(segment_columns + ["Metric"], na_position="first", ignore_index=True)
+    return forecasts, timings
@@ -0,0 +1,207 @@
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import concat_frames, use_streaming
+
+# Interval (detik) pemeriksaan perubahan file sumber
+RELOAD_SECONDS = float(os.environ.get("DASHBOARD_RELOAD_SECONDS", "5"))
+
+logger = logging.getLogger(__name__)
+
+
+# Fungsi untuk menghitung hash setiap baris mentah (isi kolom saja, tanpa index)
+def row_hashes(df):
+    return pd.util.hash_pandas_object(df, index=False).values
+
+
+# Fungsi untuk menandai baris di `hashes` yang tidak punya pasangan di `other`.
+# Baris kembar dihitung satu per satu: jika ada 3 baris sama di data lama dan 2
+# di data baru, satu baris lama dianggap dihapus
+def unmatched(hashes, other):
+    hashes = pd.Series(hashes)
+    occurrence = hashes.groupby(hashes).cumcount()
+    available = hashes.map(pd.Series(other).value_counts()).fillna(0)
+    return (occurrence >= available).values
+
+
+# Cube yang mengikuti file sumbernya. Saat file berubah, baris mentah yang baru
+# dibandingkan dengan versi sebelumnya lewat hash per baris:
+# - append: baris lama tidak berubah, hanya baris di akhir yang baru
+# - modify: baris yang hilang dikurangkan dan baris baru ditambahkan
+# Hanya baris yang berubah yang dibersihkan dan diagregasi; sel cube, index
+# filter, dan sidik jari (key cache figure) diperbarui dari selisih tersebut.
+# Yang disimpan hanya hash baris mentah dan baris bersih yang sudah ringkas
+# (index = posisi baris di file), bukan baris mentah itu sendiri. Pada mode
+# streaming baris tidak disimpan sama sekali, jadi cube dibangun ulang penuh
+class LiveCube:
+    def __init__(self, path, read, clean, build, load, streaming=None):
+        self.path = path
+        self.read = read
+        self.clean = clean
+        self.build = build
+        self.load = load
+        self.streaming = use_streaming(path) if streaming is None else streaming
+        self.lock = threading.Lock()
+        self.version = 0
+        self.last_change = None
+        self._load()
+
+    # Fungsi untuk mengambil tanda versi file (waktu ubah dan ukuran)
+    def _signature(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    # Fungsi untuk membaca file sumber (index = posisi baris di file)
+    def _read(self):
+        return self.read(self.path).reset_index(drop=True)
+
+    # Fungsi untuk membaca ulang semua data
+    def _load(self):
+        self.signature = self._signature()
+        if self.streaming:
+            self.rows = self.hashes = None
+            self.cube = self.build(self.load(self.path, streaming=True))
+        else:
+            rows = self._read()
+            self.hashes = row_hashes(rows)
+            self.rows = self.clean(rows)
+            self.cube = self.build(self.rows)
+
+    # Fungsi untuk membersihkan sebagian baris mentah (None jika kosong)
+    def _clean(self, rows):
+        return self.clean(rows.copy()) if len(rows) else None
+
+    # Fungsi untuk menyusun baris bersih versi baru. Baris yang tidak berubah
+    # diambil dari versi lama dan dipindah ke posisi barunya: baris kembar ke-k
+    # di file lama dipasangkan dengan baris kembar ke-k di file baru, sama
+    # seperti unmatched(). Hanya baris baru (added) yang dibersihkan ulang
+    def _next_rows(self, rows, hashes, added_mask, removed_mask, added):
+        old_positions = np.flatnonzero(~removed_mask)
+        new_positions = np.flatnonzero(~added_mask)
+        old_positions = old_positions[np.argsort(self.hashes[old_positions], kind="stable")]
+        new_positions = new_positions[np.argsort(hashes[new_positions], kind="stable")]
+        moved = pd.Series(new_positions, index=old_positions)
+
+        kept = self.rows[self.rows.index.isin(old_positions)]
+        kept = kept.set_axis(moved.loc[kept.index].values)
+        if added is None:
+            return kept.sort_index()
+        # compact_frame pada beberapa baris saja bisa tidak memilih category
+        categorical = {column: "category" for column in kept.columns
+                       if isinstance(kept[column].dtype, pd.CategoricalDtype)}
+        return concat_frames([kept, added.astype(categorical)]).sort_index()
+
+    # Fungsi untuk memeriksa file dan memperbarui cube jika berubah.
+    # Mengembalikan True jika data berubah
+    def refresh(self):
+        with self.lock:
+            try:
+                signature = self._signature()
+            except OSError:
+                return False
+            if signature == self.signature:
+                return False
+
+            start = time.perf_counter()
+            if self.rows is None:
+                self._load()
+                change = {"kind": "reload"}
+            else:
+                rows = self._read()
+                hashes = row_hashes(rows)
+                n_old = len(self.hashes)
+                if len(hashes) >= n_old and np.array_equal(hashes[:n_old], self.hashes):
+                    added_mask = np.arange(len(hashes)) >= n_old
+                    removed_mask = np.zeros(n_old, dtype=bool)
+                    change = {"kind": "append"}
+                else:
+                    added_mask = unmatched(hashes, self.hashes)
+                    removed_mask = unmatched(self.hashes, hashes)
+                    change = {"kind": "modify"}
+                # Baris yang dihapus sudah bersih; baris yang dibuang saat clean tidak ada di self.rows
+                added = self._clean(rows[added_mask])
+                removed = self.rows[self.rows.index.isin(np.flatnonzero(removed_mask))]
+                self.cube = self.cube.apply(added, removed if len(removed) else None)
+                self.rows = self._next_rows(rows, hashes, added_mask, removed_mask, added)
+                self.hashes, self.signature = hashes, signature
+                change.update(added=int(added_mask.sum()), removed=int(removed_mask.sum()))
+
+            self.version += 1
+            self.last_change = {**change, "version": self.version, "seconds": time.perf_counter() - start}
+            logger.info("Reloaded %s: %s", self.path, self.last_change)
+            return True
+
+    # Fungsi untuk menjalankan pemantau file di thread latar
+    def start_watching(self, interval=RELOAD_SECONDS):
+        def watch():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.refresh()
+                except Exception:
+                    # File bisa sedang ditulis (mis. workbook belum selesai disimpan):
+                    # data lama tetap dipakai dan file dicoba lagi pada interval berikutnya
+                    logger.exception("Could not reload %s", self.path)
+
+        threading.Thread(target=watch, daemon=True, name=f"watch-{os.path.basename(self.path)}").start()
+        return self
+
+
+# Versi LiveCube untuk backend SQL (sql_backend.SqlCube): database dibangun
+# ulang dari file sumber saat file berubah, jadi selalu memakai jalur reload.
+# build(path) membuat SqlCube, mis. pipelines.build_sales_sql_cube
+class LiveSqlCube(LiveCube):
+    def __init__(self, path, build):
+        super().__init__(path, read=None, clean=None, build=build, load=None, streaming=True)
+
+    # Fungsi untuk membangun (atau memakai ulang) database dari file sumber
+    def _load(self):
+        self.signature = self._signature()
+        self.rows = self.hashes = None
+        self.cube = self.build(self.path)
+
+
+# Versi LiveCube untuk data bersama (shared_store.py): baris bersih dibaca dari
+# file Arrow yang di-memory-map, jadi cube dibangun tanpa menyalin baris ke
+# memori proses. Saat file sumber berubah, proses pertama menerbitkan versi
+# baru dan selisih baris dihitung dari baris bersih (tanpa clean ulang).
+# load_shared(path) membaca data bersama, mis. pipelines.load_shared_sales
+class LiveSharedCube(LiveCube):
+    def __init__(self, path, load_shared, build):
+        super().__init__(path, read=load_shared, clean=_unchanged, build=build, load=None, streaming=False)
+
+    # Data bersama sudah ber-index RangeIndex; reset_index akan menyalin setiap
+    # kolom keluar dari buffer yang di-map
+    def _read(self):
+        return self.read(self.path)
+
+    # Fungsi untuk me-map data bersama dan membangun cube langsung darinya
+    def _load(self):
+        self.signature = self._signature()
+        self.rows = self._read()
+        self.hashes = row_hashes(self.rows)
+        self.cube = self.build(self.rows)
+
+    # Versi baru sudah berupa baris bersih yang di-map, jadi langsung dipakai
+    # (menyusun salinan dari versi lama akan menyalin baris ke memori proses)
+    def _next_rows(self, rows, hashes, added_mask, removed_mask, added):
+        return rows
+
+
+# Fungsi clean untuk baris yang sudah bersih
+def _unchanged(rows):
+    return rows
+
+
+# Fragment halaman: diperiksa setiap RELOAD_SECONDS, dan jika versi data sudah
+# berubah sejak halaman dirender, seluruh halaman dirender ulang dengan data baru
+@st.fragment(run_every=RELOAD_SECONDS)
+def rerun_on_change(live, version):
+    if live.version != version:
+        st.rerun()
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Folder penyimpanan model SARIMAX yang sudah di-fit
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".models")
+
+# Re-estimasi penuh dijalankan setelah sekian periode baru ditambahkan tanpa fit ulang
+REFIT_EVERY = 12
+
+# Re-estimasi penuh juga dijalankan jika rata-rata |error standar| periode baru melebihi batas ini
+DRIFT_THRESHOLD = 3.0
+
+
+# Fungsi untuk membuat key dari isi deret waktu saja (nilai, index, dan nama)
+def series_key(series):
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(series, index=True).values.tobytes())
+    digest.update(repr(series.name).encode())
+    return digest.hexdigest()[:16]
+
+
+# Fungsi untuk membuat key model dari isi deret waktu dan order model
+def model_key(series, order, seasonal_order):
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(series, index=True).values.tobytes())
+    digest.update(repr((series.name, tuple(order), tuple(seasonal_order))).encode())
+    return digest.hexdigest()[:16]
+
+
+# Fungsi untuk menentukan lokasi file model di disk
+def model_path(key):
+    return os.path.join(MODEL_DIR, f"sarimax-{key}.pickle")
+
+
+# Fungsi untuk menentukan file lineage: catatan model terakhir untuk satu deret
+# (nama deret + order), dipakai untuk mendeteksi periode yang baru ditambahkan
+def lineage_path(series, order, seasonal_order):
+    key = hashlib.sha256(repr((series.name, tuple(order), tuple(seasonal_order))).encode()).hexdigest()[:16]
+    return os.path.join(MODEL_DIR, f"lineage-{key}.json")
+
+
+# Fungsi untuk nama file sementara: PID dan id thread, karena beberapa worker
+# (proses atau thread, mis. forecast_service) bisa menyimpan file yang sama bersamaan
+def _temporary(path):
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+# Fungsi untuk menyimpan model ke disk secara atomik
+def _save(results, path):
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    temporary = _temporary(path)
+    results.save(temporary)
+    os.replace(temporary, path)
+
+
+# Fungsi untuk memperpanjang model terakhir dengan periode baru (parameter tetap).
+# Mengembalikan None jika data lama berubah, model lama hilang, sudah waktunya
+# re-estimasi (REFIT_EVERY), atau error pada periode baru terlalu besar (drift)
+def _extend(lineage, series, order, seasonal_order):
+    n_old = lineage["n_obs"]
+    old_path = model_path(lineage["key"])
+    if n_old >= len(series) or not os.path.exists(old_path):
+        return None, 0
+    if model_key(series[:n_old], order, seasonal_order) != lineage["key"]:
+        return None, 0
+    appended = lineage["appended"] + len(series) - n_old
+    if appended >= REFIT_EVERY:
+        return None, 0
+
+    from statsmodels.tsa.statespace.sarimax import SARIMAXResults
+    results = SARIMAXResults.load(old_path).append(series[n_old:], refit=False)
+    errors = results.filter_results.standardized_forecasts_error[0, n_old:]
+    if np.nanmean(np.abs(errors)) > DRIFT_THRESHOLD:
+        return None, 0
+    return results, appended
+
+
+# Fungsi untuk mengambil model dari disk, atau fit lalu simpan jika belum ada.
+# Optimizer hanya dijalankan jika data atau order model berubah. Jika data hanya
+# bertambah di akhir (mis. bulan baru), model lama cukup diperpanjang dengan
+# parameter yang sama (incremental=True) tanpa fit ulang. Dengan
+# incremental=False model selalu di-fit penuh dan lineage tidak disentuh.
+# statsmodels baru diimpor di sini (sekitar 1 detik), bukan saat modul diimpor
+def load_or_fit(series, order=(1, 1, 1), seasonal_order=(1, 1, 1, 12), incremental=True):
+    from statsmodels.tsa.statespace.sarimax import SARIMAX, SARIMAXResults
+
+    key = model_key(series, order, seasonal_order)
+    path = model_path(key)
+    if os.path.exists(path):
+        return SARIMAXResults.load(path)
+
+    lineage_file = lineage_path(series, order, seasonal_order)
+    results, appended = None, 0
+    if incremental and os.path.exists(lineage_file):
+        with open(lineage_file) as f:
+            results, appended = _extend(json.load(f), series, order, seasonal_order)
+    if results is None:
+        results = SARIMAX(series, order=order, seasonal_order=seasonal_order).fit(disp=False)
+
+    _save(results, path)
+    if not incremental:
+        return results
+    temporary = _temporary(lineage_file)
+    with open(temporary, "w") as f:
+        json.dump({"key": key, "n_obs": len(series), "appended": appended}, f)
+    os.replace(temporary, lineage_file)
+    return results
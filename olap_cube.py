@@ -0,0 +1,63 @@
+import copy
+import hashlib
+
+import pandas as pd
+
+from data_loader import compact_frame, concat_frames
+from filter_index import FilterIndex
+
+
+# Cube pra-agregasi: data dijumlahkan sekali untuk setiap kombinasi dimensi
+# filter dan dimensi chart. Filter dan chart setelah itu hanya bekerja pada sel
+# cube, jadi biaya setiap rerun sebanding dengan jumlah sel, bukan jumlah baris.
+# Data boleh berupa baris mentah (Transactions = 1) atau hasil stream_aggregate.
+class Cube:
+    def __init__(self, df, dimensions, measures, filters):
+        self.dimensions = dimensions
+        self.measures = measures + ["Transactions"]
+        self.filters = filters
+        self._set_cells(self._aggregate(df))
+
+    # Fungsi untuk menjumlahkan baris per kombinasi dimensi.
+    # sort=False menjaga urutan kemunculan, dropna=False menjaga baris dengan dimensi kosong,
+    # observed=True agar dimensi category tidak menghasilkan semua kombinasi kategori
+    def _aggregate(self, df):
+        return df.groupby(by=self.dimensions, dropna=False, sort=False, observed=True)[self.measures].sum().reset_index()
+
+    # Fungsi untuk memasang sel cube beserta index filter dan sidik jarinya
+    def _set_cells(self, cells):
+        self.cells = compact_frame(cells, schema={column: "category" for column in self.filters})
+        self.filter_index = FilterIndex(self.cells, self.filters)
+        # Sidik jari isi cube, dipakai sebagai bagian key cache figure
+        self.fingerprint = hashlib.sha256(pd.util.hash_pandas_object(self.cells).values.tobytes()).hexdigest()[:16]
+
+    # Fungsi untuk membuat cube baru dari cube ini secara inkremental: baris yang
+    # ditambahkan dijumlahkan ke sel dan baris yang dihapus dikurangkan, tanpa
+    # mengagregasi ulang semua baris. Cube lama tidak diubah, jadi rerun yang
+    # sedang berjalan tetap membaca data yang konsisten
+    def apply(self, added=None, removed=None):
+        parts = [self.cells]
+        if added is not None and len(added):
+            parts.append(self._aggregate(added))
+        if removed is not None and len(removed):
+            negative = self._aggregate(removed)
+            negative[self.measures] = -negative[self.measures]
+            parts.append(negative)
+        cube = copy.copy(self)
+        cells = self._aggregate(concat_frames(parts, ignore_index=True))
+        # Sel tanpa transaksi tersisa (semua barisnya dihapus) dibuang
+        cube._set_cells(cells[cells["Transactions"] != 0].reset_index(drop=True))
+        return cube
+
+    # Fungsi untuk mengambil daftar pilihan filter
+    def values(self, column):
+        return self.filter_index.values(column)
+
+    # Fungsi untuk mengambil sel cube yang lolos filter
+    def select(self, selections):
+        return self.cells[self.filter_index.mask(selections)]
+
+
+# Fungsi untuk roll-up sel cube ke dimensi chart tertentu
+def rollup(cells, by, measures):
+    return cells.groupby(by=by, observed=True)[measures].sum().reset_index()
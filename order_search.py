@@ -0,0 +1,89 @@
+import itertools
+import json
+import os
+import time
+import warnings
+from concurrent.futures import as_completed
+
+import numpy as np
+import pandas as pd
+
+from backtest import _backtest_block, summarize_backtest
+from forecasting import limited_process_pool
+from model_store import MODEL_DIR, load_or_fit, series_key
+
+
+# Fungsi untuk membuat grid kandidat order SARIMAX yang dibatasi
+def candidate_orders(p=(0, 1, 2), d=(1,), q=(0, 1, 2), P=(0, 1), D=(1,), Q=(0, 1), s=12):
+    return [
+        ((p_, d_, q_), (P_, D_, Q_, s))
+        for p_, d_, q_, P_, D_, Q_ in itertools.product(p, d, q, P, D, Q)
+    ]
+
+
+# Fungsi worker: fit satu kandidat dan hitung skornya. Kandidat yang gagal atau
+# tidak konvergen langsung dipangkas (tanpa backtest)
+def _score_candidate(series, order, seasonal_order, criterion, max_horizon):
+    start = time.perf_counter()
+    row = {"Order": list(order), "Seasonal Order": list(seasonal_order)}
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            results = load_or_fit(series, order, seasonal_order, incremental=False)
+            if not results.mle_retvals.get("converged", True):
+                raise RuntimeError("optimizer did not converge")
+            row.update(AIC=float(results.aic), BIC=float(results.bic), Status="ok", Error=None)
+            if criterion == "backtest":
+                origins = list(range(max(len(series) // 2, 2), len(series)))
+                predictions = pd.DataFrame(_backtest_block(series, origins, max_horizon, order, seasonal_order, 0.05))
+                row["Backtest MAE"] = float(summarize_backtest(predictions)["MAE"].mean())
+    except Exception as error:
+        row.update(Status="pruned", Error=f"{type(error).__name__}: {error}")
+    row["Seconds"] = time.perf_counter() - start
+    return row
+
+
+# Fungsi untuk menentukan file memo hasil pencarian satu deret
+def _memo_path(series, criterion, max_horizon):
+    return os.path.join(MODEL_DIR, f"search-{series_key(series)}-{criterion}-{max_horizon}.json")
+
+
+# Fungsi untuk mencari order SARIMAX terbaik dari grid kandidat berdasarkan
+# "aic", "bic", atau "backtest" (rata-rata MAE backtest). Kandidat di-fit paralel
+# dan skornya dimemo per deret, jadi pencarian ulang pada data yang sama
+# langsung kembali. Mengembalikan (order, seasonal_order, tabel kandidat)
+def search_orders(series, candidates=None, criterion="aic", max_horizon=3, max_workers=None):
+    candidates = candidates or candidate_orders()
+    score_column = {"aic": "AIC", "bic": "BIC", "backtest": "Backtest MAE"}[criterion]
+
+    memo_file = _memo_path(series, criterion, max_horizon)
+    memo = {}
+    if os.path.exists(memo_file):
+        with open(memo_file) as f:
+            memo = json.load(f)
+
+    pending = [c for c in candidates if repr(c) not in memo]
+    if pending:
+        with limited_process_pool(max_workers) as executor:
+            futures = {
+                executor.submit(_score_candidate, series, order, seasonal_order, criterion, max_horizon): (order, seasonal_order)
+                for order, seasonal_order in pending
+            }
+            for future in as_completed(futures):
+                memo[repr(futures[future])] = future.result()
+        os.makedirs(MODEL_DIR, exist_ok=True)
+        temporary = f"{memo_file}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(memo, f)
+        os.replace(temporary, memo_file)
+
+    table = pd.DataFrame([memo[repr(c)] for c in candidates])
+    table = table.reindex(columns=["Order", "Seasonal Order", "AIC", "BIC", "Backtest MAE", "Status", "Seconds", "Error"])
+    table = table.sort_values(score_column, na_position="last", ignore_index=True)
+    table["Order"] = table["Order"].map(tuple)
+    table["Seasonal Order"] = table["Seasonal Order"].map(tuple)
+
+    best = table[table["Status"] == "ok"]
+    if best.empty or np.isnan(best[score_column].iloc[0]):
+        raise ValueError("No SARIMAX candidate converged")
+    return best["Order"].iloc[0], best["Seasonal Order"].iloc[0], table
@@ -0,0 +1,213 @@
+import argparse
+import json
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data_loader import _file_key, _normalize_for_parquet
+
+# Folder data terpartisi disimpan di samping file sumber
+PARTITION_DIR = ".partitions"
+
+# Isi setiap partisi: baris bersih ("rows") dan sel yang sudah dijumlahkan per
+# bulan ("monthly", dimensi dan measure sama seperti sel cube)
+LEVELS = ("rows", "monthly")
+
+# Nama file data di dalam folder satu partisi
+PART_FILE = "part-0.parquet"
+
+
+# Fungsi untuk menentukan folder data terpartisi dari file sumber dan isi file
+def partition_root(path, name):
+    folder = os.path.join(os.path.dirname(os.path.abspath(path)), PARTITION_DIR)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(folder, f"{stem}-{name}-{_file_key(path)}")
+
+
+# Fungsi untuk menghapus folder partisi lama dari sumber yang sama
+def _remove_stale(root):
+    folder = os.path.dirname(root)
+    name = os.path.basename(root)
+    prefix = name.rsplit("-", 1)[0] + "-"
+    for other in os.listdir(folder):
+        if other.startswith(prefix) and other != name and not other.startswith(name + "."):
+            shutil.rmtree(os.path.join(folder, other), ignore_errors=True)
+
+
+# Fungsi untuk nama folder satu partisi (gaya Hive, jadi juga bisa dibaca
+# langsung oleh DuckDB atau pyarrow.dataset)
+def _partition_path(year, month):
+    return f"year={year}/month={month:02d}"
+
+
+# Fungsi untuk mengubah nilai numpy/pandas menjadi nilai JSON
+def _json_value(value):
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return value.item() if hasattr(value, "item") else value
+
+
+# Fungsi untuk menghitung min/max setiap kolom angka dan tanggal satu partisi
+def _column_stats(df):
+    stats = {}
+    for column in df.columns:
+        values = df[column]
+        if pd.api.types.is_bool_dtype(values):
+            continue
+        if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_datetime64_any_dtype(values):
+            values = values.dropna()
+            if len(values):
+                stats[column] = {"min": _json_value(values.min()), "max": _json_value(values.max())}
+    return stats
+
+
+# Fungsi untuk menulis data terpartisi per tahun/bulan: untuk setiap bulan satu
+# file baris bersih dan satu file sel bulanan, plus stats.json berisi jumlah
+# baris dan min/max per kolom setiap partisi. Baris tanpa tanggal tidak punya
+# partisi. Folder ditulis ke lokasi sementara lalu dipindah sekaligus
+def write_partitions(df, root, dimensions, measures, date_column="Date"):
+    tmp = f"{root}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    df = _normalize_for_parquet(df)
+    dates = pd.to_datetime(df[date_column])
+    partitions = []
+    for (year, month), rows in df.groupby([dates.dt.year.rename("year"), dates.dt.month.rename("month")]):
+        # Sama seperti Cube._aggregate: dimensi kosong tetap menjadi sel sendiri
+        monthly = rows.groupby(by=dimensions, dropna=False, sort=False, observed=True)[measures].sum().reset_index()
+        entry = {"year": int(year), "month": int(month), "path": _partition_path(int(year), int(month))}
+        for level, part in (("rows", rows), ("monthly", monthly)):
+            target = os.path.join(tmp, level, entry["path"], PART_FILE)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            part.to_parquet(target, index=False)
+            entry[level] = {"rows": len(part), "stats": _column_stats(part)}
+        partitions.append(entry)
+
+    os.makedirs(tmp, exist_ok=True)
+    with open(os.path.join(tmp, "stats.json"), "w") as f:
+        json.dump({"date_column": date_column, "columns": {"rows": list(df.columns),
+                                                           "monthly": dimensions + measures},
+                   "partitions": partitions}, f, indent=2)
+    try:
+        os.replace(tmp, root)
+    except OSError:
+        # Proses lain sudah lebih dulu menulis versi yang sama
+        shutil.rmtree(tmp, ignore_errors=True)
+    _remove_stale(root)
+
+
+# Data terpartisi per tahun/bulan. Semua keputusan partisi mana yang dibaca
+# diambil dari stats.json (min/max tanggal per partisi), jadi bulan di luar
+# rentang tidak pernah dibuka. Rentang [start, end] termasuk kedua ujungnya
+class PartitionedData:
+    def __init__(self, root):
+        self.root = root
+        with open(os.path.join(root, "stats.json")) as f:
+            meta = json.load(f)
+        self.date_column = meta["date_column"]
+        self.level_columns = meta["columns"]
+        self.partitions = meta["partitions"]
+
+    # Fungsi untuk mengambil daftar kolom satu tingkat data
+    def columns(self, level="rows"):
+        return self.level_columns[level]
+
+    # Fungsi untuk mengambil tanggal paling awal dan paling akhir dari statistik saja
+    def date_range(self):
+        stats = [partition["rows"]["stats"][self.date_column] for partition in self.partitions]
+        return pd.Timestamp(min(s["min"] for s in stats)), pd.Timestamp(max(s["max"] for s in stats))
+
+    # Fungsi untuk memilih partisi yang min/max tanggalnya beririsan dengan rentang
+    def prune(self, start=None, end=None, level="rows"):
+        selected = []
+        for partition in self.partitions:
+            stats = partition[level]["stats"][self.date_column]
+            if start is not None and pd.Timestamp(stats["max"]) < pd.Timestamp(start):
+                continue
+            if end is not None and pd.Timestamp(stats["min"]) > pd.Timestamp(end):
+                continue
+            selected.append(partition)
+        return selected
+
+    # Fungsi untuk membaca beberapa partisi menjadi satu DataFrame. Kolom
+    # category dari setiap file digabung menjadi satu set kategori. Tanpa
+    # partisi yang cocok, hasilnya kosong dengan skema dari partisi pertama
+    def _read(self, partitions, level, columns):
+        if not self.partitions:
+            return pd.DataFrame(columns=columns or self.columns(level))
+        tables = [pq.read_table(os.path.join(self.root, level, partition["path"], PART_FILE), columns=columns)
+                  for partition in partitions or self.partitions[:1]]
+        table = pa.concat_tables(tables)
+        return table.to_pandas() if partitions else table.slice(0, 0).to_pandas()
+
+    # Fungsi untuk membuang baris di luar rentang (partisi tepi bisa berisi keduanya)
+    def _within(self, df, start, end):
+        dates = df[self.date_column]
+        mask = pd.Series(True, index=df.index)
+        if start is not None:
+            mask &= dates >= pd.Timestamp(start)
+        if end is not None:
+            mask &= dates <= pd.Timestamp(end)
+        return df[mask].reset_index(drop=True)
+
+    # Fungsi untuk membaca data dalam rentang tanggal: hanya partisi yang lolos
+    # prune() yang dibaca. columns membatasi kolom yang dibaca dari file
+    def read(self, start=None, end=None, level="rows", columns=None):
+        read_columns = None if columns is None else list(dict.fromkeys([*columns, self.date_column]))
+        df = self._within(self._read(self.prune(start, end, level), level, read_columns), start, end)
+        return df if columns is None else df[list(columns)]
+
+    # Fungsi untuk membaca n baris pertama dalam rentang, partisi demi partisi dari awal
+    def head(self, n=5, start=None, end=None, columns=None):
+        return self._edge(n, start, end, columns, reverse=False).head(n)
+
+    # Fungsi untuk membaca n baris terakhir dalam rentang, partisi demi partisi dari akhir
+    def tail(self, n=5, start=None, end=None, columns=None):
+        return self._edge(n, start, end, columns, reverse=True).tail(n)
+
+    # Fungsi untuk membaca partisi dari salah satu ujung sampai terkumpul n baris
+    def _edge(self, n, start, end, columns, reverse):
+        read_columns = None if columns is None else list(dict.fromkeys([*columns, self.date_column]))
+        partitions = self.prune(start, end)
+        parts, count = [], 0
+        for partition in reversed(partitions) if reverse else partitions:
+            parts.append(self._within(self._read([partition], "rows", read_columns), start, end))
+            count += len(parts[-1])
+            if count >= n:
+                break
+        if not parts:
+            parts = [self._read([], "rows", read_columns)]
+        df = pd.concat(parts[::-1] if reverse else parts, ignore_index=True)
+        return df if columns is None else df[list(columns)]
+
+
+# Fungsi untuk membaca data terpartisi: proses pertama menjalankan load(path)
+# dan menulis partisinya, pembacaan berikutnya hanya membuka stats.json selama
+# file sumber tidak berubah
+def load_partitioned(path, name, load, dimensions, measures, date_column="Date"):
+    root = partition_root(path, name)
+    if not os.path.exists(os.path.join(root, "stats.json")):
+        write_partitions(load(path), root, dimensions, measures, date_column)
+    return PartitionedData(root)
+
+
+# Fungsi untuk membuat daftar awal bulan dari start sampai end (pilihan filter periode)
+def months_between(start, end):
+    return list(pd.date_range(pd.Timestamp(start).to_period("M").to_timestamp(), end, freq="MS"))
+
+
+def main():
+    from pipelines import load_financial_partitions
+
+    parser = argparse.ArgumentParser(description="Write the financial data partitioned by year and month.")
+    parser.parse_args()
+
+    data = load_financial_partitions()
+    first, last = data.date_range()
+    print(f"{len(data.partitions)} monthly partitions from {first:%Y-%m} to {last:%Y-%m} in {data.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import pandas as pd
+
+from aggregates import AggregateState
+from data_loader import (
+    add_moment_columns,
+    compact_frame,
+    iter_chunks,
+    moment_columns,
+    parse_accounting_numbers,
+    read_table,
+    stream_aggregate,
+    use_streaming,
+)
+from olap_cube import Cube, rollup
+from partitions import load_partitioned
+from shared_store import load_shared
+from sql_backend import SqlCube
+
+# Kurs konversi USD ke Rupiah untuk KPI
+IDR_PER_USD = 16500
+
+# ---- SALES (supermarkt_sales.xlsx) ----
+SALES_FILE = "supermarkt_sales.xlsx"
+SALES_READ_KWARGS = {"sheet_name": "Sales", "skiprows": 3, "usecols": "B:R"}
+
+# Dtype ringkas untuk kolom filter dan chart; kolom lain diatur otomatis oleh compact_frame
+SALES_SCHEMA = {
+    "City": "category",
+    "Customer_type": "category",
+    "Gender": "category",
+    "Product line": "category",
+    "Payment": "category",
+}
+SALES_FILTERS = ["City", "Customer_type", "Gender"]
+SALES_DIMENSIONS = ["City", "Customer_type", "Gender", "Product line", "Payment", "hour"]
+SALES_MEASURES = ["Total", "Rating"]
+
+
+# Add 'hour' and 'minute' columns to dataframe (integer, dihitung sekali saat load)
+def add_hour(df):
+    seconds = pd.to_timedelta(df["Time"].astype(str)).dt.total_seconds()
+    df["hour"] = (seconds // 3600).astype("int8")
+    df["minute"] = (seconds % 3600 // 60).astype("int8")
+    return df.drop(columns="Time")
+
+
+# Fungsi untuk membersihkan baris penjualan mentah menjadi baris ringkas
+def clean_sales(df):
+    df = add_hour(df)
+    df["Transactions"] = 1
+    return compact_frame(df, schema=SALES_SCHEMA)
+
+
+# Fungsi untuk membaca baris penjualan mentah
+def read_sales_rows(path=SALES_FILE):
+    return read_table(path, engine="openpyxl", **SALES_READ_KWARGS)
+
+
+# Fungsi untuk membaca data penjualan: baris ringkas, atau agregat per chunk untuk file besar
+def load_sales_data(path=SALES_FILE, streaming=None):
+    if streaming is None:
+        streaming = use_streaming(path)
+    if streaming:
+        # File besar: baca per chunk dan simpan agregat per kombinasi filter/chart saja
+        return stream_aggregate(
+            iter_chunks(path, **SALES_READ_KWARGS),
+            by=SALES_DIMENSIONS,
+            sums=SALES_MEASURES,
+            prepare=add_hour,
+        )
+    return clean_sales(read_sales_rows(path))
+
+
+# Fungsi untuk membaca data penjualan dari file Arrow bersama (lihat shared_store.py)
+def load_shared_sales(path=SALES_FILE):
+    return load_shared(path, "sales", load_sales_data)
+
+
+# Fungsi untuk membuat cube penjualan: semua filter dan chart dijawab dari sel cube
+def build_sales_cube(data):
+    return Cube(data, dimensions=SALES_DIMENSIONS, measures=SALES_MEASURES, filters=SALES_FILTERS)
+
+
+# Fungsi untuk membuat backend SQL penjualan (DuckDB/SQLite) dengan hasil yang sama seperti build_sales_cube
+def build_sales_sql_cube(path=SALES_FILE, engine=None):
+    return SqlCube.from_file(path, SALES_READ_KWARGS, clean_sales, dimensions=SALES_DIMENSIONS,
+                             measures=SALES_MEASURES, filters=SALES_FILTERS, engine=engine)
+
+
+# Fungsi untuk membuat state KPI penjualan yang bisa digabung (per chunk,
+# partisi, atau sel cube). Jumlah transaksi diambil dari kolom Transactions
+def sales_kpi_state(cells):
+    return AggregateState.from_frame(cells, sums=["Total", "Rating"], count_column="Transactions")
+
+
+# Fungsi untuk menghitung KPI app.py dari state; kurs dikalikan sekali di akhir.
+# Rata-rata dihitung dari jumlah / Transactions agar sama untuk data per baris maupun agregat
+def sales_kpis_from_state(state):
+    total, rating = state.sums["Total"], state.sums["Rating"]
+    return {
+        "total_sales": int(total.sum) * IDR_PER_USD,
+        "average_sale_by_transaction": int(round(total.mean)) * IDR_PER_USD,
+        "average_rating": round(rating.mean, 1),
+    }
+
+
+# Fungsi untuk menghitung KPI app.py dari sel cube yang lolos filter
+def sales_kpis(cells):
+    return sales_kpis_from_state(sales_kpi_state(cells))
+
+
+# ---- FINANCIAL (financial_sample.xlsx) ----
+FINANCIAL_FILE = "financial_sample.xlsx"
+FINANCIAL_READ_KWARGS = {"sheet_name": "Sales"}
+
+# Kolom numerik untuk heatmap korelasi
+CORRELATION_COLUMNS = ['Manufacturing Price', 'Sale Price', 'Sales', 'Profit']
+
+# Dimensi cube: filter sidebar ditambah semua dimensi chart
+FINANCIAL_FILTERS = ["Country", "Segment", "Product"]
+FINANCIAL_DIMENSIONS = ["Country", "Segment", "Product", "Discount Band", "Date"]
+FINANCIAL_MEASURES = CORRELATION_COLUMNS + moment_columns(CORRELATION_COLUMNS)
+
+
+# Fungsi untuk menyiapkan data (atau satu chunk pada mode streaming) sebelum diagregasi
+def prepare_financial(df):
+    # Angka format akuntansi ("(1,234)", "$ 1,000", "-") diubah menjadi float64 dalam satu tahap,
+    # lalu baris dengan NaN di kolom Profit dihapus
+    df = df.copy()
+    df[CORRELATION_COLUMNS] = df[CORRELATION_COLUMNS].apply(parse_accounting_numbers)
+    df = df.dropna(subset=["Profit"])
+    # Tanggal dibulatkan ke awal bulan agar jumlah grup tidak bergantung pada jumlah baris
+    df["Date"] = pd.to_datetime(df["Date"]).dt.to_period("M").dt.to_timestamp()
+    return add_moment_columns(df, CORRELATION_COLUMNS)
+
+
+# Fungsi untuk membersihkan baris finansial mentah menjadi baris ringkas
+def clean_financial(df):
+    df = prepare_financial(df)
+    df["Transactions"] = 1
+    return compact_frame(df, schema={column: "category" for column in FINANCIAL_DIMENSIONS[:4]})
+
+
+# Fungsi untuk membaca baris finansial mentah
+def read_financial_rows(path=FINANCIAL_FILE):
+    return read_table(path, **FINANCIAL_READ_KWARGS)
+
+
+# Fungsi untuk membaca data finansial: baris ringkas, atau agregat per chunk untuk file besar
+def load_financial_data(path=FINANCIAL_FILE, streaming=None):
+    if streaming is None:
+        streaming = use_streaming(path)
+    if streaming:
+        # Mode streaming: file dibaca per chunk dan hanya agregatnya yang disimpan
+        return stream_aggregate(
+            iter_chunks(path, **FINANCIAL_READ_KWARGS),
+            by=FINANCIAL_DIMENSIONS,
+            sums=FINANCIAL_MEASURES,
+            prepare=prepare_financial,
+        )
+    return clean_financial(read_financial_rows(path))
+
+
+# Fungsi untuk membaca data finansial dari file Arrow bersama
+def load_shared_financial(path=FINANCIAL_FILE):
+    return load_shared(path, "financial", load_financial_data)
+
+
+# Fungsi untuk membuat cube finansial
+def build_financial_cube(data):
+    return Cube(data, dimensions=FINANCIAL_DIMENSIONS, measures=FINANCIAL_MEASURES, filters=FINANCIAL_FILTERS)
+
+
+# Fungsi untuk membuat backend SQL finansial (DuckDB/SQLite)
+def build_financial_sql_cube(path=FINANCIAL_FILE, engine=None):
+    return SqlCube.from_file(path, FINANCIAL_READ_KWARGS, clean_financial, dimensions=FINANCIAL_DIMENSIONS,
+                             measures=FINANCIAL_MEASURES, filters=FINANCIAL_FILTERS, engine=engine)
+
+
+# Fungsi untuk membuat state KPI finansial yang bisa digabung
+def financial_kpi_state(cells):
+    return AggregateState.from_frame(cells, sums=["Sales", "Profit"], count_column="Transactions")
+
+
+# Fungsi untuk menghitung KPI streamlit_app.py dari state; kurs dikalikan sekali di akhir
+def financial_kpis_from_state(state):
+    sales, profit = state.sums["Sales"], state.sums["Profit"]
+    total_sales = int(sales.sum * IDR_PER_USD)
+    total_profit = int(profit.sum * IDR_PER_USD)
+    return {
+        "total_sales": total_sales,
+        "average_sale_by_transaction": int(round(sales.mean * IDR_PER_USD)),
+        "total_profit": total_profit,
+        "profit_percentage": total_profit / total_sales * 100,
+    }
+
+
+# Fungsi untuk menghitung KPI streamlit_app.py dari sel cube yang lolos filter
+def financial_kpis(cells):
+    return financial_kpis_from_state(financial_kpi_state(cells))
+
+
+# Fungsi untuk membuat deret bulanan (akhir bulan, seperti resample('M') di
+# Prediction_Financial.py) dari sel cube finansial
+def financial_monthly(cells, columns=("Sales", "Profit")):
+    return rollup(cells, ["Date"], list(columns)).set_index("Date").resample('M').sum()
+
+
+# Fungsi untuk membaca data finansial terpartisi per tahun/bulan (lihat partitions.py):
+# baris bersih dan sel bulanan (dimensi dan measure cube) per partisi
+def load_financial_partitions(path=FINANCIAL_FILE):
+    return load_partitioned(path, "financial", load_financial_data, dimensions=FINANCIAL_DIMENSIONS,
+                            measures=FINANCIAL_MEASURES + ["Transactions"])
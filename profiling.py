@@ -0,0 +1,191 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+# Jika diisi, setiap rerun ditulis sebagai satu baris JSON ke file ini
+PROFILE_LOG_ENV = "DASHBOARD_PROFILE_LOG"
+
+# Jika diisi, metrik Prometheus disajikan di http://<host>:<port>/metrics
+METRICS_PORT_ENV = "DASHBOARD_METRICS_PORT"
+
+# Jumlah rerun terakhir yang disimpan untuk log dan panel diagnostik
+HISTORY_SIZE = 200
+
+
+# Fungsi untuk membaca RSS proses saat ini (byte). Ringan karena hanya membaca
+# /proc; di sistem tanpa /proc mengembalikan None
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# Kumpulan metrik per proses, dipakai bersama oleh semua sesi dan semua halaman
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.totals = {}
+        self.history = deque(maxlen=HISTORY_SIZE)
+
+    # Fungsi untuk mencatat satu rerun yang sudah selesai
+    def record(self, rerun):
+        with self.lock:
+            self.history.append(rerun)
+            for stage in rerun["stages"] + [{"stage": "total", "seconds": rerun["seconds"]}]:
+                total = self.totals.setdefault((rerun["page"], stage["stage"]), {"count": 0, "seconds": 0.0, "last": 0.0})
+                total["count"] += 1
+                total["seconds"] += stage["seconds"]
+                total["last"] = stage["seconds"]
+            path = os.environ.get(PROFILE_LOG_ENV)
+            if path:
+                with open(path, "a") as f:
+                    f.write(json.dumps(rerun) + "\n")
+
+    # Fungsi untuk mengekspor rerun terakhir sebagai log terstruktur (JSON lines)
+    def json_lines(self):
+        with self.lock:
+            return "".join(json.dumps(rerun) + "\n" for rerun in self.history)
+
+    # Fungsi untuk mengekspor total per halaman/tahap dalam format teks Prometheus
+    def prometheus_text(self):
+        lines = [
+            "# HELP dashboard_stage_seconds_total Wall time spent in each dashboard stage.",
+            "# TYPE dashboard_stage_seconds_total counter",
+        ]
+        with self.lock:
+            totals = sorted(self.totals.items())
+        label = lambda page, stage: f'{{page="{page}",stage="{stage}"}}'
+        lines += [f"dashboard_stage_seconds_total{label(*key)} {value['seconds']:.6f}" for key, value in totals]
+        lines += [
+            "# HELP dashboard_stage_runs_total Number of times each dashboard stage ran.",
+            "# TYPE dashboard_stage_runs_total counter",
+        ]
+        lines += [f"dashboard_stage_runs_total{label(*key)} {value['count']}" for key, value in totals]
+        lines += [
+            "# HELP dashboard_stage_last_seconds Wall time of the most recent run of each stage.",
+            "# TYPE dashboard_stage_last_seconds gauge",
+        ]
+        lines += [f"dashboard_stage_last_seconds{label(*key)} {value['last']:.6f}" for key, value in totals]
+        rss = _rss_bytes()
+        if rss is not None:
+            lines += [
+                "# HELP dashboard_resident_memory_bytes Resident memory of the dashboard process.",
+                "# TYPE dashboard_resident_memory_bytes gauge",
+                f"dashboard_resident_memory_bytes {rss}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+# Handler HTTP untuk endpoint /metrics
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = registry.prometheus_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server_lock = threading.Lock()
+_server = None
+
+
+# Fungsi untuk menjalankan endpoint Prometheus di thread latar (sekali per proses)
+def start_metrics_server(port):
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer(("", port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server
+
+
+# Pencatat waktu dan perubahan memori per tahap untuk satu rerun halaman
+class RerunProfiler:
+    def __init__(self, page):
+        self.page = page
+        self.stages = []
+        self.started = self.last = time.perf_counter()
+        self.last_rss = _rss_bytes()
+        self.timestamp = datetime.now(timezone.utc).isoformat()
+        port = os.environ.get(METRICS_PORT_ENV)
+        if port:
+            start_metrics_server(int(port))
+
+    # Fungsi untuk mencatat satu tahap yang berakhir sekarang. Tahap dengan nama
+    # yang sama dalam satu rerun (mis. beberapa group-by) dijumlahkan
+    def _add(self, name, start, rss_before):
+        self.last = time.perf_counter()
+        self.last_rss = _rss_bytes()
+        seconds = self.last - start
+        memory = None if rss_before is None else self.last_rss - rss_before
+        for stage in self.stages:
+            if stage["stage"] == name:
+                stage["seconds"] = round(stage["seconds"] + seconds, 6)
+                if memory is not None:
+                    stage["memory_delta_bytes"] += memory
+                return
+        self.stages.append({"stage": name, "seconds": round(seconds, 6), "memory_delta_bytes": memory})
+
+    # Fungsi untuk mengukur satu blok: with profiler.stage("st.pyplot"): ...
+    @contextmanager
+    def stage(self, name):
+        rss_before = _rss_bytes()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(name, start, rss_before)
+
+    # Fungsi untuk menutup tahap yang berjalan sejak tahap sebelumnya selesai,
+    # supaya bagian panjang skrip bisa diukur tanpa dibungkus blok with
+    def lap(self, name):
+        self._add(name, self.last, self.last_rss)
+
+    # Fungsi untuk menutup rerun: simpan ke registry dan kembalikan catatannya
+    def finish(self):
+        rerun = {
+            "timestamp": self.timestamp,
+            "page": self.page,
+            "pid": os.getpid(),
+            "seconds": round(time.perf_counter() - self.started, 6),
+            "rss_bytes": _rss_bytes(),
+            "stages": self.stages,
+        }
+        registry.record(rerun)
+        return rerun
+
+
+# Fungsi untuk menutup rerun dan menampilkan panel diagnostik di sidebar
+def render_diagnostics(profiler):
+    import streamlit as st
+
+    rerun = profiler.finish()
+    with st.sidebar.expander("Diagnostics", expanded=False):
+        timings = pd.DataFrame(rerun["stages"], columns=["stage", "seconds", "memory_delta_bytes"])
+        timings["memory delta (MiB)"] = timings.pop("memory_delta_bytes") / 2**20
+        st.dataframe(timings, hide_index=True, use_container_width=True)
+        st.caption(f"Rerun: {rerun['seconds']:.3f} s, process RSS: {(rerun['rss_bytes'] or 0) / 2**20:.0f} MiB")
+        st.download_button("Export log (JSON lines)", registry.json_lines(), file_name="dashboard_timings.jsonl",
+                           mime="application/x-ndjson")
+        st.download_button("Export Prometheus metrics", registry.prometheus_text(), file_name="metrics.prom",
+                           mime="text/plain")
@@ -0,0 +1,129 @@
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ThreadPoolExecutor, wait
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# DASHBOARD_PROGRESSIVE=0 menghitung semua bagian langsung di tempatnya (tanpa thread latar)
+PROGRESSIVE_ENV = "DASHBOARD_PROGRESSIVE"
+
+# Jumlah thread untuk bagian berat, dipakai bersama oleh semua sesi
+MAX_WORKERS = 4
+
+# Selang (detik) pemeriksaan rerun baru saat skrip menunggu bagian latar
+POLL_SECONDS = 0.25
+
+
+# Fungsi untuk menentukan apakah bagian berat dihitung di thread latar
+def use_progressive():
+    return os.environ.get(PROGRESSIVE_ENV, "1").lower() not in ("0", "false", "no")
+
+
+# Thread pool satu per proses
+@st.cache_resource
+def _executor():
+    return ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="section")
+
+
+# Bagian halaman yang dihitung di thread latar. Setiap submit() langsung
+# memasang placeholder di posisinya, jadi KPI dan tabel ringan di bawahnya
+# tetap tampil lebih dulu; finish() mengisi placeholder sesuai urutan selesai.
+# Saat menunggu, skrip memanggil API Streamlit setiap POLL_SECONDS; Streamlit
+# menghentikan skrip di pemanggilan itu jika ada rerun baru (mis. filter
+# diubah), jadi rerun lama tidak menunggu semua bagiannya selesai. Bagian
+# yang belum dimulai dibatalkan dan hasil bagian yang sedang berjalan dibuang
+class Sections:
+    def __init__(self, page):
+        self.progressive = use_progressive()
+        self.cancelled = threading.Event()
+        self.futures = []
+        self.pending = []
+        key = f"_sections_{page}"
+        previous = st.session_state.get(key)
+        if previous is not None:
+            previous.cancel()
+        st.session_state[key] = self
+
+    # Fungsi worker: memakai konteks rerun halaman, jadi fungsi ber-cache
+    # Streamlit (st.cache_data/st.cache_resource) tetap bisa dipakai di thread latar
+    def _run(self, ctx, compute):
+        if self.cancelled.is_set():
+            raise CancelledError()
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return compute()
+
+    # Fungsi untuk menjalankan compute() di latar. Jika render diberikan, hasilnya
+    # ditampilkan di placeholder pada posisi pemanggilan (atau di dalam container)
+    # oleh render(hasil); jika tidak, hasilnya diambil dengan result(future)
+    def submit(self, compute, render=None, container=None, label="Loading..."):
+        placeholder = None
+        if render is not None:
+            placeholder = (container or st).empty()
+        if not self.progressive:
+            future = _completed(compute)
+            if placeholder is not None:
+                with placeholder.container():
+                    render(future.result())
+            return future
+
+        if placeholder is not None:
+            placeholder.caption(label)
+        future = _executor().submit(self._run, get_script_run_ctx(), compute)
+        self.futures.append(future)
+        if placeholder is not None:
+            self.pending.append((future, placeholder, render, label))
+        return future
+
+    # Fungsi untuk menunggu satu hasil yang dipakai langsung oleh skrip
+    def result(self, future, label="Loading..."):
+        if future.done():
+            return future.result()
+        heartbeat = st.empty()
+        finished = False
+        try:
+            with st.spinner(label):
+                while not wait([future], timeout=POLL_SECONDS).done:
+                    heartbeat.empty()
+            finished = True
+        finally:
+            if not finished:
+                self.cancel()
+        return future.result()
+
+    # Fungsi untuk membatalkan semua bagian rerun ini
+    def cancel(self):
+        self.cancelled.set()
+        for future in self.futures:
+            future.cancel()
+
+    # Fungsi untuk mengisi placeholder begitu hasilnya siap (urutan selesai).
+    # Selama belum ada yang selesai, label placeholder pertama yang masih
+    # menunggu ditulis ulang agar rerun baru terdeteksi
+    def finish(self):
+        placeholders = {future: (placeholder, render, label) for future, placeholder, render, label in self.pending}
+        pending = set(placeholders)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    placeholder, render, _ = placeholders[future]
+                    with placeholder.container():
+                        render(future.result())
+                if pending and not done:
+                    placeholder, _, label = placeholders[next(iter(pending))]
+                    placeholder.caption(label)
+        finally:
+            if pending:
+                self.cancel()
+            self.pending = []
+
+
+# Fungsi untuk menjalankan compute() langsung dan membungkus hasilnya seperti future
+def _completed(compute):
+    future = Future()
+    try:
+        future.set_result(compute())
+    except Exception as error:
+        future.set_exception(error)
+    return future
@@ -0,0 +1,98 @@
+import argparse
+import logging
+import os
+
+import pandas as pd
+import pyarrow as pa
+
+from data_loader import _file_key, _normalize_for_parquet
+
+# Folder file Arrow bersama disimpan di samping file sumber
+SHARED_DIR = ".shared"
+
+# DASHBOARD_SHARED=1: semua proses dashboard membaca baris bersih dari satu
+# file Arrow yang di-memory-map, bukan menyimpan salinan sendiri
+SHARED_ENV = "DASHBOARD_SHARED"
+
+logger = logging.getLogger(__name__)
+
+
+# Fungsi untuk menentukan apakah data bersama dipakai
+def use_shared():
+    return os.environ.get(SHARED_ENV, "0").lower() in ("1", "true", "yes")
+
+
+# Fungsi untuk menentukan lokasi file Arrow dari file sumber dan isi file
+def shared_path(path, name):
+    folder = os.path.join(os.path.dirname(os.path.abspath(path)), SHARED_DIR)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(folder, f"{stem}-{name}-{_file_key(path)}.arrow")
+
+
+# Fungsi untuk menghapus file Arrow lama dari sumber yang sama. Proses yang
+# masih memakai versi lama tetap bisa membacanya selama file masih di-map
+def _remove_stale(target):
+    folder = os.path.dirname(target)
+    name = os.path.basename(target)
+    prefix = name.rsplit("-", 1)[0] + "-"
+    for other in os.listdir(folder):
+        if other.startswith(prefix) and not other.startswith(name):
+            try:
+                os.remove(os.path.join(folder, other))
+            except OSError:
+                # Di Windows file yang sedang di-map tidak bisa dihapus
+                logger.warning("Could not remove old shared file %s", other)
+
+
+# Fungsi untuk menulis DataFrame ke file Arrow IPC tanpa kompresi, supaya
+# kolomnya bisa di-map langsung tanpa didekode
+def publish(df, target):
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    table = pa.Table.from_pandas(_normalize_for_parquet(df), preserve_index=False)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, target)
+    _remove_stale(target)
+
+
+# Kolom teks dibiarkan sebagai array Arrow (pd.ArrowDtype), jadi tetap menunjuk
+# ke memori file dan tidak disalin menjadi objek Python per baris
+def _types_mapper(arrow_type):
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+# Fungsi untuk membuka file Arrow secara read-only lewat memory map. Kolom angka
+# tanpa nilai kosong menjadi array numpy di atas halaman file yang sama, jadi
+# semua proses berbagi satu salinan di page cache sistem operasi
+def attach(target):
+    table = pa.ipc.open_file(pa.memory_map(target, "r")).read_all()
+    return table.to_pandas(split_blocks=True, types_mapper=_types_mapper)
+
+
+# Fungsi untuk membaca data bersama: proses pertama menjalankan load(path) dan
+# menerbitkan hasilnya, proses lain (dan rerun berikutnya) hanya me-map file
+def load_shared(path, name, load):
+    target = shared_path(path, name)
+    if not os.path.exists(target):
+        publish(load(path), target)
+    return attach(target)
+
+
+def main():
+    from pipelines import load_shared_financial, load_shared_sales
+
+    parser = argparse.ArgumentParser(description="Publish the cleaned dashboard data as shared Arrow files.")
+    parser.add_argument("--datasets", nargs="+", choices=["sales", "financial"], default=["sales", "financial"])
+    args = parser.parse_args()
+
+    loaders = {"sales": load_shared_sales, "financial": load_shared_financial}
+    for dataset in args.datasets:
+        df = loaders[dataset]()
+        print(f"{dataset}: {len(df)} rows published")
+
+
+if __name__ == "__main__":
+    main()
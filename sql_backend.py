@@ -0,0 +1,224 @@
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from data_loader import _file_key, _kwargs_key, compact_frame, iter_chunks
+
+# Folder database SQL disimpan di samping file sumber
+WAREHOUSE_DIR = ".warehouse"
+
+# Backend filter dan agregasi: "pandas" (cube di memori), "duckdb", atau "sqlite".
+# Diatur lewat env DASHBOARD_BACKEND
+BACKEND_ENV = "DASHBOARD_BACKEND"
+
+# Nama tabel baris di database
+TABLE = "rows"
+
+# Kolom urutan baris asli, agar urutan sel sama dengan groupby(sort=False) di Cube
+ROW_COLUMN = "_row"
+
+logger = logging.getLogger(__name__)
+
+
+# Fungsi untuk menentukan engine SQL dari env DASHBOARD_BACKEND. None berarti
+# memakai cube pandas. DuckDB opsional: jika tidak terpasang, dipakai sqlite3
+def sql_engine():
+    backend = os.environ.get(BACKEND_ENV, "pandas").lower()
+    if backend not in ("duckdb", "sqlite"):
+        return None
+    if backend == "duckdb" and importlib.util.find_spec("duckdb") is None:
+        logger.warning("duckdb is not installed, using sqlite instead")
+        return "sqlite"
+    return backend
+
+
+# Fungsi untuk memberi tanda kutip pada nama kolom (mis. "Sale Price * Sales")
+def quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+# Fungsi untuk membuka koneksi database; hanya-baca untuk query dashboard
+def connect(path, engine, read_only=True):
+    if engine == "duckdb":
+        import duckdb
+        return duckdb.connect(path, read_only=read_only)
+    if read_only:
+        return sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    return sqlite3.connect(path)
+
+
+# Fungsi untuk menentukan lokasi database dari file sumber, engine, dan isi file
+def warehouse_path(path, read_kwargs, engine):
+    folder = os.path.join(os.path.dirname(os.path.abspath(path)), WAREHOUSE_DIR)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(folder, f"{stem}-{engine}-{_kwargs_key(read_kwargs)}-{_file_key(path)}.{engine}")
+
+
+# Fungsi untuk menghapus database lama dari file sumber yang sama. File milik
+# isi yang sama (metadata, atau .tmp proses lain yang sedang membangun) dibiarkan
+def _remove_stale_databases(target):
+    folder = os.path.dirname(target)
+    name = os.path.basename(target)
+    prefix = name.rsplit("-", 1)[0] + "-"
+    for other in os.listdir(folder):
+        if other.startswith(prefix) and not other.startswith(name):
+            try:
+                os.remove(os.path.join(folder, other))
+            except OSError:
+                # Database lama bisa masih dibuka proses lain (mis. di Windows)
+                logger.warning("Could not remove old database %s", other)
+
+
+# Fungsi untuk menyalin file sumber ke database per chunk, jadi memori hanya
+# sebesar satu chunk. Setiap chunk dibersihkan dengan fungsi yang sama seperti
+# pada cube pandas. Tabel dibuat dari chunk pertama, jadi kolom integer (yang
+# di-downcast per chunk oleh compact_frame) disimpan sebagai int64 agar nilai
+# besar di chunk berikutnya tetap muat. Mengembalikan dtype kolom hasil clean
+# (dari chunk pertama), dipakai untuk mengembalikan dtype hasil query
+def _ingest(con, engine, path, read_kwargs, clean, filters):
+    dtypes, offset = None, 0
+    for chunk in iter_chunks(path, **read_kwargs):
+        chunk = clean(chunk)
+        if dtypes is None:
+            dtypes = chunk.dtypes
+        chunk.insert(0, ROW_COLUMN, range(offset, offset + len(chunk)))
+        offset += len(chunk)
+        # Kategori per chunk bisa berbeda, jadi disimpan sebagai teks biasa
+        chunk = chunk.astype({column: object for column in chunk.columns[chunk.dtypes == "category"]})
+        chunk = chunk.astype({column: "int64" for column in chunk.columns
+                              if pd.api.types.is_integer_dtype(chunk[column])
+                              and not pd.api.types.is_bool_dtype(chunk[column])})
+        if engine == "duckdb":
+            con.register("chunk", chunk)
+            if offset == len(chunk):
+                con.execute(f"CREATE TABLE {TABLE} AS SELECT * FROM chunk")
+            else:
+                con.execute(f"INSERT INTO {TABLE} SELECT * FROM chunk")
+            con.unregister("chunk")
+        else:
+            chunk.to_sql(TABLE, con, if_exists="append", index=False)
+    if engine == "sqlite":
+        # DuckDB memakai zone map per blok; SQLite butuh index untuk kolom filter
+        for column in filters:
+            con.execute(f"CREATE INDEX {quote('idx ' + column)} ON {TABLE} ({quote(column)})")
+    con.commit()
+    return dtypes
+
+
+# Backend SQL dengan antarmuka yang sama seperti Cube (values, select, cells,
+# fingerprint): filter sidebar dikirim sebagai WHERE ... IN (?, ...) dan
+# agregasi per kombinasi dimensi sebagai GROUP BY. Baris disimpan sekali di
+# satu file database yang dibaca bersama oleh semua proses dashboard; hasil
+# select sama dengan Cube.select untuk filter yang sama
+class SqlCube:
+    def __init__(self, path, engine, dtypes, dimensions, measures, filters):
+        self.path = path
+        self.engine = engine
+        self.dtypes = dtypes
+        self.dimensions = dimensions
+        self.measures = measures + ["Transactions"]
+        self.filters = filters
+        self.fingerprint = hashlib.sha256(os.path.basename(path).encode()).hexdigest()[:16]
+        self.con = connect(path, engine)
+        self.lock = threading.Lock()
+        self._options = {}
+        self._has_missing = {}
+        self._cells = None
+
+    # Fungsi untuk membuat (atau memakai ulang) database dari file sumber. Jika
+    # proses lain sudah membuat database untuk isi file yang sama, file itu dipakai.
+    # Tanpa engine, dipakai engine dari DASHBOARD_BACKEND (atau sqlite)
+    @classmethod
+    def from_file(cls, path, read_kwargs, clean, dimensions, measures, filters, engine=None):
+        engine = engine or sql_engine() or "sqlite"
+        target = warehouse_path(path, read_kwargs, engine)
+        dtypes_path = target + ".json"
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp = f"{target}.{os.getpid()}.tmp"
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            con = connect(tmp, engine, read_only=False)
+            try:
+                dtypes = _ingest(con, engine, path, read_kwargs, clean, filters)
+            finally:
+                con.close()
+            with open(dtypes_path, "w") as f:
+                json.dump({column: str(dtype) for column, dtype in dtypes.items()}, f)
+            os.replace(tmp, target)
+            _remove_stale_databases(target)
+        with open(dtypes_path) as f:
+            dtypes = json.load(f)
+        return cls(target, engine, dtypes, dimensions, measures, filters)
+
+    # Fungsi untuk menjalankan query berparameter dan mengembalikan DataFrame
+    def query(self, sql, params=()):
+        with self.lock:
+            if self.engine == "duckdb":
+                return self.con.execute(sql, list(params)).df()
+            return pd.read_sql_query(sql, self.con, params=list(params))
+
+    # Fungsi untuk mengambil daftar pilihan filter, urut sesuai kemunculan
+    def values(self, column):
+        if column not in self._options:
+            options = self.query(
+                f"SELECT {quote(column)} AS value FROM {TABLE} "
+                f"GROUP BY {quote(column)} ORDER BY MIN({ROW_COLUMN})")
+            self._has_missing[column] = bool(options["value"].isna().any())
+            self._options[column] = pd.Index(options["value"].dropna().tolist())
+        return self._options[column]
+
+    # Fungsi untuk menyusun klausa WHERE dari pilihan filter: OR di dalam satu
+    # kolom (IN) dan AND antar kolom, sama seperti FilterIndex.mask
+    def _where(self, selections):
+        clauses, params = [], []
+        for column, selected in selections.items():
+            options = self.values(column)
+            chosen = set(selected)
+            selected = [value for value in options if value in chosen]
+            # Semua nilai dipilih ("Select All"): kolom ini tidak perlu difilter
+            if not self._has_missing[column] and len(selected) == len(options):
+                continue
+            if not selected:
+                clauses.append("1 = 0")
+                continue
+            clauses.append(f"{quote(column)} IN ({', '.join('?' * len(selected))})")
+            params.extend(selected)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    # Fungsi untuk mengubah hasil query ke dtype yang sama dengan sel Cube
+    def _restore_types(self, cells):
+        for column in cells.columns:
+            dtype = self.dtypes.get(column)
+            if dtype is None:
+                continue
+            if pd.api.types.is_datetime64_any_dtype(dtype):
+                cells[column] = pd.to_datetime(cells[column]).astype(dtype)
+            elif pd.api.types.is_integer_dtype(dtype):
+                cells[column] = cells[column].astype("int64")
+        schema = {column: "category" for column in self.dimensions if self.dtypes.get(column) == "category"}
+        return compact_frame(cells, schema={**schema, **{column: "category" for column in self.filters}})
+
+    # Fungsi untuk mengambil sel (jumlah per kombinasi dimensi) yang lolos filter
+    def select(self, selections):
+        where, params = self._where(selections)
+        dimensions = ", ".join(quote(column) for column in self.dimensions)
+        sums = ", ".join(f"SUM({quote(column)}) AS {quote(column)}" for column in self.measures)
+        cells = self.query(
+            f"SELECT {dimensions}, {sums} FROM {TABLE}{where} "
+            f"GROUP BY {dimensions} ORDER BY MIN({ROW_COLUMN})", params)
+        return self._restore_types(cells)
+
+    # Semua sel tanpa filter (mis. untuk rentang tanggal di sidebar)
+    @property
+    def cells(self):
+        if self._cells is None:
+            self._cells = self.select({})
+        return self._cells
@@ -0,0 +1,120 @@
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Halaman yang diukur dan library berat yang dicatat apakah sudah diimpor
+PAGES = ["app.py", "streamlit_app.py", "Prediction_Financial.py"]
+HEAVY_MODULES = ["plotly.express", "matplotlib.pyplot", "seaborn", "statsmodels"]
+
+# Tahap RerunProfiler sampai KPI tampil
+KPI_STAGE = "kpi"
+
+
+# Fungsi untuk mengambil import tingkat modul dari sebuah halaman (import di
+# dalam fungsi atau di tengah skrip setelah KPI tidak dihitung)
+def top_level_imports(page):
+    with open(page) as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+        elif not isinstance(node, ast.Expr):
+            break
+    return modules
+
+
+# Worker (proses baru): waktu import semua import awal halaman
+def _import_worker(page):
+    modules = top_level_imports(page)
+    start = time.perf_counter()
+    for module in modules:
+        __import__(module)
+    return {"import_seconds": time.perf_counter() - start, "modules": modules}
+
+
+# Worker (proses baru): jalankan halaman sekali lewat AppTest. Waktu sampai KPI
+# = waktu rerun penuh dikurangi tahap yang dicatat RerunProfiler setelah KPI
+def _run_worker(page):
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    import profiling
+
+    at = AppTest.from_file(page, default_timeout=600).run()
+    seconds = time.perf_counter() - start
+    result = {
+        "run_seconds": seconds,
+        "exceptions": [str(e.value) for e in at.exception],
+        "loaded": [module for module in HEAVY_MODULES if module in sys.modules],
+    }
+    history = profiling.registry.history
+    if history:
+        stages = [stage["stage"] for stage in history[-1]["stages"]]
+        if KPI_STAGE in stages:
+            after_kpi = history[-1]["stages"][stages.index(KPI_STAGE) + 1:]
+            result["first_kpi_seconds"] = seconds - sum(stage["seconds"] for stage in after_kpi)
+    return result
+
+
+# Fungsi untuk menjalankan satu worker di interpreter baru (cold start)
+def _measure(kind, page):
+    output = subprocess.run([sys.executable, __file__, "--worker", kind, page],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+# Fungsi untuk mengukur satu halaman beberapa kali dan mengambil mediannya
+def bench_page(page, repeat):
+    imports = [_measure("import", page) for _ in range(repeat)]
+    runs = [_measure("run", page) for _ in range(repeat)]
+    result = {
+        "page": page,
+        "modules": imports[0]["modules"],
+        "import_seconds": statistics.median(run["import_seconds"] for run in imports),
+        "run_seconds": statistics.median(run["run_seconds"] for run in runs),
+        "loaded_after_run": runs[0]["loaded"],
+        "exceptions": runs[0]["exceptions"],
+    }
+    if all("first_kpi_seconds" in run for run in runs):
+        result["first_kpi_seconds"] = statistics.median(run["first_kpi_seconds"] for run in runs)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import time and time to first KPI of each page.")
+    parser.add_argument("--pages", nargs="+", default=PAGES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="startup_results.json")
+    parser.add_argument("--worker", nargs=2, metavar=("KIND", "PAGE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        kind, page = args.worker
+        worker = _import_worker if kind == "import" else _run_worker
+        print(json.dumps(worker(page)))
+        return
+
+    results = []
+    for page in args.pages:
+        result = bench_page(page, args.repeat)
+        results.append(result)
+        first_kpi = result.get("first_kpi_seconds")
+        print(f"{page}: imports {result['import_seconds']:.2f} s, "
+              f"first KPI {'-' if first_kpi is None else f'{first_kpi:.2f} s'}, "
+              f"full run {result['run_seconds']:.2f} s")
+
+    with open(args.output, "w") as f:
+        json.dump({"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0],
+                   "cwd": os.getcwd(), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
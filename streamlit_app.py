@@ -1,24 +1,53 @@
-import pandas as pd  # pip install pandas openpyxl --user
-import numpy as np  # pip install numpy 
-import plotly.express as px # pip install plotly-express --user
-import plotly.graph_objects as go
-import matplotlib.pyplot as plt # pip install matplotlib --user
-from matplotlib.gridspec import GridSpec
-import seaborn as sns # pip install seaborn --user
 import streamlit as st  # pip install streamlit --user
+from hot_reload import LiveCube, LiveSharedCube, LiveSqlCube, rerun_on_change
+from partitions import months_between
+from pipelines import (
+    FINANCIAL_FILE,
+    FINANCIAL_FILTERS,
+    build_financial_cube,
+    build_financial_sql_cube,
+    clean_financial,
+    financial_kpis,
+    load_financial_data,
+    load_financial_partitions,
+    load_shared_financial,
+    read_financial_rows,
+)
+from profiling import RerunProfiler, render_diagnostics
+from progressive import Sections
+from shared_store import use_shared
+from sql_backend import sql_engine
 
 st.set_page_config(page_title="Financial Dashboard", layout="wide")
 
-# Fungsi untuk membaca data dari file Excel
-def read_excel_data():
-    file_path = "financial_sample.xlsx"
-    sheet_name = "Sales"
-    nrows = 700
-    df = pd.read_excel(file_path, sheet_name=sheet_name, nrows=nrows)
-    return df
+# Waktu dan memori setiap tahap rerun, ditampilkan di sidebar "Diagnostics"
+profiler = RerunProfiler("financial")
+
+# Cube dibuat sekali per proses: semua filter dan chart dijawab dari sel cube.
+# File sumber dipantau dan cube diperbarui inkremental saat file berubah.
+# Dengan DASHBOARD_BACKEND=duckdb/sqlite, filter dan agregasi dijalankan sebagai SQL;
+# dengan DASHBOARD_SHARED=1, baris bersih di-map dari file Arrow bersama
+@st.cache_resource
+def get_live_cube():
+    if sql_engine() is not None:
+        return LiveSqlCube(FINANCIAL_FILE, build_financial_sql_cube).start_watching()
+    if use_shared():
+        return LiveSharedCube(FINANCIAL_FILE, load_shared_financial, build_financial_cube).start_watching()
+    return LiveCube(FINANCIAL_FILE, read_financial_rows, clean_financial, build_financial_cube,
+                    load_financial_data).start_watching()
+
+# Cube untuk satu periode, dibangun dari partisi bulanan yang sudah dijumlahkan
+# (lihat partitions.py): statistik min/max per partisi menentukan file mana yang
+# dibaca, jadi bulan di luar periode tidak dibaca sama sekali. version ikut
+# menjadi key cache agar cube periode dibangun ulang setelah file sumber berubah
+@st.cache_resource(max_entries=32)
+def get_period_cube(start, end, version):
+    return build_financial_cube(load_financial_partitions().read(start, end, level="monthly"))
 
 # Membaca data dari file Excel
-data = read_excel_data()
+live_cube = get_live_cube()
+cube = live_cube.cube
+profiler.lap("load")
 
 # def get_data_from_csv():
 #     df = pd.read_csv("financials.csv", sep=";")  # Membaca CSV dengan delimiter koma
@@ -31,7 +60,7 @@ data = read_excel_data()
 st.sidebar.header("Please Filter Here:")
 
 # Filter untuk negara
-all_countries = data["Country"].unique()
+all_countries = cube.values("Country")
 country_selection = st.sidebar.checkbox("Select All Country", value=True)
 if country_selection:
     selected_countries = all_countries
@@ -39,7 +68,7 @@ else:
     selected_countries = st.sidebar.multiselect("Select the Country:", options=all_countries, default=all_countries)
 
 # Filter untuk segmen pelanggan
-all_segments = data["Segment"].unique()
+all_segments = cube.values("Segment")
 segment_selection = st.sidebar.checkbox("Select All Segment", value=True)
 if segment_selection:
     selected_segments = all_segments
@@ -47,29 +76,39 @@ else:
     selected_segments = st.sidebar.multiselect("Select the Segment:", options=all_segments, default=all_segments)
 
 # Filter untuk produk 
-all_products = data["Product"].unique() 
+all_products = cube.values("Product") 
 product_selection = st.sidebar.checkbox("Select All Products", value=True)
 if product_selection:
     selected_products = all_products
 else:
     selected_products = st.sidebar.multiselect("Select the Product:", options=all_products, default=all_products)
 
-# Pembersihan data untuk nilai non-numerik di kolom Profit
-df_selection = data.copy()  # Buat salinan dataframe untuk diubah
-
-# Ganti nilai non-numerik ("-") dengan NaN
-df_selection["Profit"] = pd.to_numeric(df_selection["Profit"], errors="coerce")
-
-# Hapus baris dengan NaN di kolom Profit
-df_selection = df_selection.dropna(subset=["Profit"])
+# Filter periode: seluruh periode memakai cube utama, periode yang lebih sempit
+# memakai cube dari partisi bulan yang dipilih saja
+months = months_between(cube.cells["Date"].min(), cube.cells["Date"].max())
+if len(months) > 1:
+    period = st.sidebar.select_slider("Select the Period:", options=months, value=(months[0], months[-1]),
+                                      format_func=lambda month: month.strftime("%Y-%m"))
+    if period != (months[0], months[-1]):
+        cube = get_period_cube(*period, live_cube.version)
+
+# Zoom chart Sales by Month: rentang yang dipilih dikirim ulang dengan resolusi penuh
+first_month, last_month = cube.cells["Date"].min().to_pydatetime(), cube.cells["Date"].max().to_pydatetime()
+if first_month < last_month:
+    month_range = st.sidebar.slider("Zoom Sales by Month:", min_value=first_month, max_value=last_month,
+                                    value=(first_month, last_month), format="YYYY-MM")
+else:
+    month_range = (first_month, last_month)
+profiler.lap("sidebar")
 
 # Seleksi dataframe berdasarkan filter yang dipilih
-df_selection = df_selection.query(
-    "Country in @selected_countries & Segment in @selected_segments & Product in @selected_products"
-)
-
-# Add 'Bulan' column to dataframe
-df_selection["Bulan"] = pd.to_datetime(df_selection["Date"], format='%Y-%m')
+selections = {
+    "Country": selected_countries,
+    "Segment": selected_segments,
+    "Product": selected_products,
+}
+with profiler.stage("filter"):
+    df_selection = cube.select(selections)
 
 # Cek apakah dataframe kosong:
 if df_selection.empty:
@@ -81,10 +120,11 @@ st.title("Financial Dashboard")
 st.markdown("##")
 
 # TOP KPI's
-total_sales = int(df_selection["Sales"].sum() * 16500)  # Menghitung total sales 
-average_sale_by_transaction = int(round(df_selection["Sales"].mean() * 16500))  # Menghitung rata-rata sales per transaksi
-total_profit = int(df_selection["Profit"].sum() * 16500) # Menghitung total profit
-presentasi = total_profit / total_sales * 100
+kpis = financial_kpis(df_selection)
+total_sales = kpis["total_sales"]  # Menghitung total sales
+average_sale_by_transaction = kpis["average_sale_by_transaction"]  # Menghitung rata-rata sales per transaksi
+total_profit = kpis["total_profit"]  # Menghitung total profit
+presentasi = kpis["profit_percentage"]
 
 left_column, middle_column, right_column = st.columns(3)
 with left_column:
@@ -96,279 +136,62 @@ with middle_column:
 with right_column:
     st.subheader("Total Profit :")
     st.subheader(f"Rp. {total_profit:,} ({presentasi:.2f} %)")
+profiler.lap("kpi")
 
 st.markdown("""---""")
 
-# SALES BY PRODUCT [BAR CHART]
-sales_by_product_Country = df_selection.groupby(by=["Product", "Country"])[["Sales"]].sum().reset_index()
-fig_product_sales = px.bar(
-    sales_by_product_Country,
-    y="Sales",
-    x="Product",
-    # orientation="h",
-    title="<b>Sales by Product</b>",
-    color="Country",
-    template="plotly_white",
-)
-# Mengubah font dan ukuran judul
-fig_product_sales.update_layout(
-    title={
-        'text': "<b>Sales by Product</b>",
-        'y': 0.9,
-        'x': 0.5,
-        'xanchor': 'center',
-        'yanchor': 'top',
-        'font': {
-            'size': 24,  # Ukuran font
-            'family': 'Arial, sans-serif',  # Font yang digunakan
-        }
-    },
-    plot_bgcolor="rgba(0,0,0,0)",
-    xaxis=dict(showgrid=False)
-)
-
-# SALES BY MONTH [LINE CHART]
-sales_by_month_Country = df_selection.groupby(by=["Bulan", "Country"])[["Sales"]].sum().reset_index()
-
-# Create the line plot
-fig_monthly_sales = px.line(
-    sales_by_month_Country,
-    x="Bulan",
-    y="Sales",
-    title="<b>Sales by Month</b>",
-    color="Country",
-    template="plotly_white",
-)
+# Modul chart (plotly) baru diimpor setelah KPI tampil, jadi KPI tidak menunggu import-nya
+from charts import FINANCIAL_CHARTS
+from figures import chart_registry
+
+# Figure dibangun dari sel cube lewat registry chart (definisi chart ada di
+# charts.py): setiap chart menyatakan filter yang dipakainya dan figure JSON-nya
+# di-cache (LRU), jadi rerun tanpa perubahan input chart tidak menjalankan
+# agregasi maupun pembuatan figure
+charts = chart_registry("financial")
+for chart_id, chart in FINANCIAL_CHARTS.items():
+    charts.register(chart_id, FINANCIAL_FILTERS, chart)
+
+# Chart bagian bawah (diskon, heatmap korelasi, profit bulanan, pivot) dihitung
+# di thread latar sementara chart bagian atas dibangun; placeholder-nya diisi
+# di akhir skrip. Jika filter diubah sebelum selesai, perhitungannya dibatalkan
+sections = Sections("financial")
+upper_section = st.container()
+st.markdown("""---""")
+lower_section = st.container()
 
-# Customize layout
-fig_monthly_sales.update_layout(
-    title={
-        'text': "<b>Sales by Month</b>",
-        'y': 0.9,
-        'x': 0.5,
-        'xanchor': 'center',
-        'yanchor': 'top',
-        'font': {
-            'size': 24,  # Ukuran font
-            'family': 'Arial, sans-serif',  # Font yang digunakan
-        }
-    },
-    plot_bgcolor="rgba(0,0,0,0)",
-    xaxis=dict(showgrid=False)
-)
 
-left_column, right_column = st.columns(2)
-left_column.plotly_chart(fig_monthly_sales, use_container_width=True)
-right_column.plotly_chart(fig_product_sales, use_container_width=True)
-
-# SALES BY SEGMENT [BAR CHART]
-sales_by_segment = df_selection.groupby(by=["Segment","Country"])[["Sales"]].sum().reset_index()
-fig_segment_sales = px.bar(
-    sales_by_segment,
-    x="Segment",
-    y="Sales",
-    color="Country",
-    title="<b>Sales by Segment</b>",
-    barmode="group",
-    template="plotly_white",
-)
+# Fungsi untuk menampilkan figure di placeholder bagian latar
+def show_chart(fig):
+    st.plotly_chart(fig, use_container_width=True)
 
-# Mengubah font dan ukuran judul
-fig_segment_sales.update_layout(
-    title={
-        'text': "<b>Sales by Segment</b>",
-        'y': 0.9,
-        'x': 0.5,
-        'xanchor': 'center',
-        'yanchor': 'top',
-        'font': {
-            'size': 24,  # Ukuran font
-            'family': 'Arial, sans-serif',  # Font yang digunakan
-        }
-    },
-    plot_bgcolor="rgba(0,0,0,0)",
-    xaxis=dict(showgrid=False)
-)
 
-# SALES BY COUNTRY [PIE CHART]
-sales_by_Country = df_selection.groupby(by=["Country"])[["Sales"]].sum()
-fig_Country_sales = px.pie(
-    sales_by_Country,
-    values="Sales",
-    names=sales_by_Country.index,
-    title="<b>Sales by Country</b>",
-    template="plotly_white",
-)
-# Mengubah font dan ukuran judul
-fig_Country_sales.update_layout(
-    title={
-        'text': "<b>Sales by Country</b>",
-        'y': 0.9,
-        'x': 0.5,
-        'xanchor': 'center',
-        'yanchor': 'top',
-        'font': {
-            'size': 24,  # Ukuran font
-            'family': 'Arial, sans-serif',  # Font yang digunakan
-        }
-    },
-    plot_bgcolor="rgba(0,0,0,0)",
-)
+with lower_section:
+    left_column, right_column = st.columns(2)
+    sections.submit(lambda: charts.figure("discount_band_sales", cube, selections), show_chart, left_column)
+    sections.submit(lambda: charts.figure("correlation_heatmap", cube, selections), show_chart, right_column)
 
-# Mengatur posisi teks pada pie chart
-fig_Country_sales.update_traces(textposition="inside", textinfo="percent+label")
+    left_column, right_column = st.columns(2)
+    sections.submit(lambda: charts.figure("monthly_product_profit", cube, selections), show_chart, left_column)
+    sections.submit(lambda: charts.figure("product_discount_profit", cube, selections), show_chart, right_column)
 
-left_column, right_column = st.columns(2)
-left_column.plotly_chart(fig_segment_sales, use_container_width=True)
-right_column.plotly_chart(fig_Country_sales, use_container_width=True)
+with profiler.stage("figure build"):
+    fig_product_sales = charts.figure("product_sales", cube, selections)
+    fig_monthly_sales = charts.figure("monthly_sales", cube, selections, x_range=month_range)
+    fig_segment_sales = charts.figure("segment_sales", cube, selections)
+    fig_Country_sales = charts.figure("country_sales", cube, selections)
 
-st.markdown("""---""")
+with profiler.stage("render"), upper_section:
+    left_column, right_column = st.columns(2)
+    left_column.plotly_chart(fig_monthly_sales, use_container_width=True)
+    right_column.plotly_chart(fig_product_sales, use_container_width=True)
 
-# Group df_selection by Discount Band
-grouped_discount = df_selection.groupby('Discount Band').agg({'Sales': 'sum'})
-grouped_discount = grouped_discount.sort_values(by='Sales', ascending=False)
-
-# Membersihkan data: menghapus tanda kurung dan mengganti '-' dengan NaN
-df_selection[['Manufacturing Price', 'Sale Price', 'Sales', 'Profit']] = (
-    df_selection[['Manufacturing Price', 'Sale Price', 'Sales', 'Profit']]
-    .replace('-', np.nan)
-    .replace(r'\((.*?)\)', r'-\1', regex=True)
-    .replace(',', '', regex=True)
-    .astype(float)
-)
+    left_column, right_column = st.columns(2)
+    left_column.plotly_chart(fig_segment_sales, use_container_width=True)
+    right_column.plotly_chart(fig_Country_sales, use_container_width=True)
 
-# Menghitung korelasi
-correlation = df_selection[['Manufacturing Price', 'Sale Price', 'Sales', 'Profit']].corr()
-
-# Membuat subplots
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-
-# Mengubah background color pada figure
-fig.patch.set_facecolor('#00172B')  # Ganti dengan warna latar belakang yang diinginkan
-
-# Plot Sales by Discount Band
-ax1.bar(grouped_discount.index, grouped_discount['Sales'], color='#E694FF', alpha=0.7)
-ax1.set_title('Sales by Discount Band', fontsize=14, color='white')  # Warna judul
-ax1.set_xlabel('Discount Band', fontsize=12, color='white')  # Warna label x-axis
-ax1.set_ylabel('Sales', fontsize=12, color='white')  # Warna label y-axis
-ax1.grid(axis='y', color='gray', linestyle='--', linewidth=0.5)
-ax1.set_facecolor('#00172B')  # Background color pada ax1
-
-# Mengubah warna tick labels pada x-axis dan y-axis
-ax1.tick_params(axis='x', colors='white')
-ax1.tick_params(axis='y', colors='white')
-
-# Mengubah warna sumbu x dan y
-ax1.spines['bottom'].set_color('white')
-ax1.spines['left'].set_color('white')
-ax1.spines['top'].set_color('white')
-ax1.spines['right'].set_color('white')
-
-# Plot heatmap of correlation
-sns.heatmap(correlation, annot=True, cmap='coolwarm', center=0, ax=ax2, cbar_kws={"shrink": .8}, annot_kws={"color": "black"})
-ax2.set_title('Correlation Heatmap', fontsize=14, color='white')  # Warna judul
-ax2.set_facecolor('#00172B')  # Background color pada ax2
-
-# Mengubah warna label pada heatmap
-for text in ax2.get_xticklabels():
-    text.set_color('white')
-for text in ax2.get_yticklabels():
-    text.set_color('white')
-
-# Mengubah warna tick labels pada heatmap
-ax2.tick_params(axis='x', colors='white')
-ax2.tick_params(axis='y', colors='white')
-
-# Mengubah warna sumbu x dan y pada heatmap
-ax2.spines['bottom'].set_color('white')
-ax2.spines['left'].set_color('white')
-ax2.spines['top'].set_color('white')
-ax2.spines['right'].set_color('white')
-
-# Menambahkan grid pada heatmap
-ax2.grid(linewidth=0.5, linestyle='--', color='gray')
-
-# Menambahkan gradient color bar
-cbar = ax2.collections[0].colorbar
-cbar.ax.tick_params(labelcolor='white')
-
-
-# Menambahkan warna latar belakang pada figure
-plt.subplots_adjust(wspace=0.4)
-st.pyplot(fig)
-
-# Create a new dataframe with total monthly profit for each product
-df_selection['Date'] = pd.to_datetime(data['Date'])
-monthly_product_profit = df_selection.groupby([df_selection['Date'].dt.year, df_selection['Date'].dt.month, 'Product']).agg({'Profit': 'sum'})
-monthly_product_profit.index.names = ['Year', 'Month', 'Product']
-monthly_product_profit.reset_index(inplace=True)
-
-# Create a 'Year-Month' column for easier plotting
-monthly_product_profit['Year-Month'] = pd.to_datetime(monthly_product_profit[['Year', 'Month']].assign(day=1))
-
-# Create a pivot table of 'Profit' with 'Product' and 'Discount Band' as dimensions
-product_discount_profit = df_selection.pivot_table(values='Profit', index='Product', columns='Discount Band', aggfunc='sum')
-
-# Membuat subplots
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-
-# Plot monthly profit for each product
-for product in monthly_product_profit['Product'].unique():
-    product_data = monthly_product_profit[monthly_product_profit['Product'] == product]
-    ax1.plot(product_data['Year-Month'], product_data['Profit'], label=product)
-ax1.set_title('Monthly Profit by Product', fontsize=14, color='white')
-ax1.set_xlabel('Date', fontsize=12, color='white')
-ax1.set_ylabel('Profit', fontsize=12, color='white')
-ax1.legend()
-ax1.grid()
-ax1.set_facecolor('#00172B')
-
-# Mengubah warna tick labels pada x-axis dan y-axis
-ax1.tick_params(axis='x', colors='white')
-ax1.tick_params(axis='y', colors='white')
-
-# Mengubah warna sumbu x dan y
-ax1.spines['bottom'].set_color('white')
-ax1.spines['left'].set_color('white')
-ax1.spines['top'].set_color('white')
-ax1.spines['right'].set_color('white')
-
-# Plot a heatmap of the pivot table (contoh plot kedua)
-sns.heatmap(product_discount_profit, annot=True, fmt='.0f', cmap='viridis', ax=ax2, cbar_kws={'label': 'Profit'},
-            annot_kws={'color': 'black', 'fontsize': 10})  # Menyesuaikan warna teks dan ukuran font
-ax2.set_title('Profit across Products and Discount Bands', fontsize=14, color='white')
-ax2.set_xlabel('Discount Band', fontsize=12, color='white')
-ax2.set_ylabel('Product', fontsize=12, color='white')
-
-# Mengubah warna label pada heatmap
-for text in ax2.get_xticklabels():
-    text.set_color('white')
-for text in ax2.get_yticklabels():
-    text.set_color('white')
-
-# Mengubah warna tick labels pada heatmap
-ax2.tick_params(axis='x', colors='white')
-ax2.tick_params(axis='y', colors='white')
-
-# Mengubah warna sumbu x dan y pada heatmap
-ax2.spines['bottom'].set_color('white')
-ax2.spines['left'].set_color('white')
-ax2.spines['top'].set_color('white')
-ax2.spines['right'].set_color('white')
-
-# Menambahkan grid pada heatmap
-ax2.grid(linewidth=0.5, linestyle='--', color='gray')
-
-# Menambahkan gradient color bar
-cbar = ax2.collections[0].colorbar
-cbar.ax.tick_params(labelcolor='white')
-cbar.set_label(label='Profit', color='white')  # Mengubah warna label degradasi warna
-
-# Mengubah background color pada figure
-fig.patch.set_facecolor('#00172B')
-
-# Menampilkan plot di Streamlit
-st.pyplot(fig)
+with profiler.stage("background sections"):
+    sections.finish()
 
 # ---- HIDE STREAMLIT STYLE ----
 hide_st_style = """
@@ -379,3 +202,9 @@ hide_st_style = """
             </style>
             """
 st.markdown(hide_st_style, unsafe_allow_html=True)
+
+# ---- HOT RELOAD ----
+rerun_on_change(live_cube, live_cube.version)
+
+# ---- DIAGNOSTICS ----
+render_diagnostics(profiler)